@@ -28,6 +28,8 @@ __version__ = '0.7.0'
 def getccversion():
     '''Return the current version of Cosmic Core.'''
     return __version__
+import importlib.util
+import os
 import subprocess
 
 #Install required dependencies automatically
@@ -35,13 +37,17 @@ def install(library):
     '''Install a Python library, assuming it is not already installed.'''
     if not isinstance(library, str):
         raise TypeError('library name must be a string')
-    try:
-        __import__(library)
-    except ImportError:
+    #A spec lookup is far cheaper than importing the library outright
+    #just to throw the module away
+    if importlib.util.find_spec(library) is None:
         subprocess.check_call(['python', '-m', 'pip', 'install', library])
 
-install('cryptography')
-install('numpy')
+#Probing (and possibly forking pip for) every dependency slows down every
+#`import cosmiccore`, so auto-installation is opt-in: set the
+#COSMICCORE_AUTOINSTALL environment variable to enable it.
+if os.environ.get('COSMICCORE_AUTOINSTALL'):
+    install('cryptography')
+    install('numpy')
 
 #Make all modules accessible with the command `from cosmiccore import`
 from .cosmicalgebra import *
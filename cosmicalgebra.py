@@ -1,5 +1,7 @@
 '''Cosmic Core: Cosmic Algebra
 \n\tA module containing data types and functions for various algebraic fields.'''
+import cmath
+import math
 import numpy
 from numpy import array, ndarray
 from .cosmicdatastructures import *
@@ -9,13 +11,143 @@ __all__ = ['quadraticformula', 'polynomial', 'matrix']
 
 #___Finding Zeroes___
 def quadraticformula(a, b, c):
-    '''Find the zeroes of a quadratic function.'''
-    zeroes = [nan, nan]
-    zeroes[0] = (((b * -1) + sqrt(pow(b, 2) - (4 * a * c))) / (2 * a))
-    zeroes[1] = (((b * -1) - sqrt(pow(b, 2) - (4 * a * c))) / (2 * a))
-    return zeroes
+    '''Find the zeroes of a quadratic function.
+    \nReturns complex zeroes when the discriminant is negative.'''
+    #Compute the discriminant and its square root exactly once, with plain
+    #multiplication instead of a pow() dispatch
+    discriminant = b * b - 4 * a * c
+    if discriminant < 0:
+        root = cmath.sqrt(discriminant)
+    else:
+        root = math.sqrt(discriminant)
+    inverse = 0.5 / a
+    return [(-b + root) * inverse, (-b - root) * inverse]
 
 #__Polynomials
+_KARATSUBA_MULTIPLY_THRESHOLD = 64 #Product length at which Karatsuba wins
+_FFT_MULTIPLY_THRESHOLD = 2048 #Product length at which FFT multiplication wins
+
+def _intabsmax(arr):
+    '''Helper function: Largest coefficient magnitude in an integer array,
+    as an exact Python int (numpy.abs would wrap on the int64 minimum).'''
+    return max(abs(int(arr.min())), abs(int(arr.max())))
+
+def _intproductbound(a, b):
+    '''Helper function: Upper bound on the magnitude of any coefficient in
+    the product of integer arrays a and b - max|a| * max|b| * overlap -
+    computed with Python ints so the bound itself cannot overflow.'''
+    return _intabsmax(a) * _intabsmax(b) * min(a.size, b.size)
+
+def _sumdtype(a, b):
+    '''Helper function: Result dtype for adding or subtracting coefficient
+    arrays a and b. Integer sums that could leave int64's range fall back
+    to object dtype, so they stay exact instead of wrapping.'''
+    if a.dtype.kind in 'biu' and b.dtype.kind in 'biu' and a.size and b.size \
+    and _intabsmax(a) + _intabsmax(b) >= 1 << 63:
+        return object
+    return numpy.result_type(a, b)
+
+def _horner(x, coeffs):
+    '''Helper function: Evaluate a polynomial over an array of x values with
+    an in-place Horner multiply-add chain.
+    \nUsing out= buffers keeps each step a single fused pass over the x
+    array with no per-step temporaries.'''
+    result = numpy.full_like(x, coeffs[-1], dtype=numpy.result_type(x, coeffs))
+    for i in range(coeffs.size - 2, -1, -1):
+        numpy.multiply(result, x, out=result)
+        numpy.add(result, coeffs[i], out=result)
+    return result
+
+def _realify(roots):
+    '''Helper function: Collapse roots with negligible imaginary parts to
+    plain floats.'''
+    cleaned = []
+    for root in roots:
+        if abs(root.imag) <= 1e-12 * max(1.0, abs(root.real)):
+            cleaned.append(root.real)
+        else:
+            cleaned.append(root)
+    return cleaned
+
+def _cubicroots(a, b, c, d):
+    '''Helper function: Return the three roots of ax^3 + bx^2 + cx + d
+    using Cardano's method.'''
+    b /= a
+    c /= a
+    d /= a
+    shift = b / 3.0
+    p = c - b * b / 3.0
+    q = 2.0 * b**3 / 27.0 - b * c / 3.0 + d
+    if p == 0 and q == 0: #Triple root
+        return [-shift] * 3
+    u = (-q / 2.0 + cmath.sqrt((q / 2.0)**2 + (p / 3.0)**3))**(1.0 / 3.0)
+    if u == 0:
+        u = (-q / 2.0 - cmath.sqrt((q / 2.0)**2 + (p / 3.0)**3))**(1.0 / 3.0)
+    omega = complex(-0.5, 0.8660254037844386) #Primitive cube root of unity
+    roots = []
+    for k in range(3):
+        u_k = u * omega**k
+        roots.append(u_k - p / (3.0 * u_k) - shift)
+    return _realify(roots)
+
+def _quarticroots(a, b, c, d, e):
+    '''Helper function: Return the four roots of ax^4 + bx^3 + cx^2 + dx + e
+    by factoring the depressed quartic with a resolvent cubic.'''
+    b /= a
+    c /= a
+    d /= a
+    e /= a
+    shift = b / 4.0
+    #Depressed quartic y^4 + p*y^2 + q*y + r
+    p = c - 3.0 * b * b / 8.0
+    q = b**3 / 8.0 - b * c / 2.0 + d
+    r = e - 3.0 * b**4 / 256.0 + b * b * c / 16.0 - b * d / 4.0
+    if q == 0: #Biquadratic: solve for y^2 directly
+        s = cmath.sqrt(p * p - 4.0 * r)
+        roots = []
+        for z in ((-p + s) / 2.0, (-p - s) / 2.0):
+            y = cmath.sqrt(z)
+            roots.extend([y - shift, -y - shift])
+        return _realify(roots)
+    #Pick the largest root of the resolvent for numerical headroom
+    z = max(_cubicroots(1.0, 2.0 * p, p * p - 4.0 * r, -q * q),
+            key=abs)
+    alpha = cmath.sqrt(z)
+    beta = (p + z - q / alpha) / 2.0
+    gamma = (p + z + q / alpha) / 2.0
+    roots = []
+    for lead, tail in ((alpha, beta), (-alpha, gamma)):
+        s = cmath.sqrt(lead * lead - 4.0 * tail)
+        roots.append((-lead + s) / 2.0 - shift)
+        roots.append((-lead - s) / 2.0 - shift)
+    return _realify(roots)
+
+def _karatsuba(a, b):
+    '''Multiply two coefficient arrays with the Karatsuba algorithm,
+    cutting the multiplication count from O(n^2) to O(n^1.585).
+    \nPrecondition: a and b are 1-D NumPy arrays.'''
+    if a.size < 32 or b.size < 32:
+        return numpy.convolve(a, b)
+    split = min(a.size, b.size) // 2
+    a_low, a_high = a[:split], a[split:]
+    b_low, b_high = b[:split], b[split:]
+    low = _karatsuba(a_low, b_low)
+    high = _karatsuba(a_high, b_high)
+    #The high halves are at least as long as the low halves, so pad the
+    #low halves into copies of the high ones before the middle product
+    a_sum = a_high.copy()
+    a_sum[:a_low.size] += a_low
+    b_sum = b_high.copy()
+    b_sum[:b_low.size] += b_low
+    middle = _karatsuba(a_sum, b_sum)
+    middle[:low.size] -= low
+    middle[:high.size] -= high
+    result = numpy.zeros(a.size + b.size - 1, dtype=middle.dtype)
+    result[:low.size] += low
+    result[split:split + middle.size] += middle
+    result[2 * split:2 * split + high.size] += high
+    return result
+
 class polynomial(object):
     '''Represents a univariate polynomial via list, with each index
     representing the power of the variable x. \n
@@ -26,32 +158,68 @@ class polynomial(object):
         if not isinstance(coefficients, (ndarray, list, linklist, dlinklist)):
             raise TypeError('coefficients must be a list, linked list, or NumPy array')
         self.coefficients = coefficients
+        #Keep a NumPy copy of the coefficients around so arithmetic can run in
+        #compiled loops instead of Python ones.
+        if isinstance(coefficients, (linklist, dlinklist)):
+            self._arr = array(coefficients.pylist())
+        else:
+            self._arr = numpy.asarray(coefficients)
+        self._deg = self._arr.size - 1
 
     def degree(self):
         '''Return the degree of the polynomial.'''
-        return len(self.coefficients) - 1
+        return self._deg
     
     def evaluate(self, x):
-        '''Evaluate the polynomial at a given value of x.'''
-        result = 0
-        for i, coeff in enumerate(self.coefficients):
-            result += coeff * x**i
-        return result
+        '''Evaluate the polynomial at a given value of x.
+        \nx may also be a NumPy array, in which case the polynomial is
+        evaluated at every element of x in a single call.'''
+        coeffs = self._arr
+        if isinstance(x, (int, numpy.integer)) and coeffs.dtype.kind in 'biO':
+            #Integer coefficients at an integer point evaluate exactly in
+            #Python - the NumPy paths overflow int64 or round in float64
+            x = int(x)
+            result = 0
+            for coefficient in reversed(coeffs.tolist()):
+                result = result * x + coefficient
+            return result
+        if numpy.isscalar(x) and coeffs.size > 16 and coeffs.dtype.kind in 'fc':
+            #Estrin's scheme: fold the coefficients pairwise while squaring x,
+            #so the partial products are independent and vectorize well
+            while coeffs.size > 1:
+                if coeffs.size % 2:
+                    coeffs = numpy.append(coeffs, 0)
+                coeffs = coeffs[0::2] + x * coeffs[1::2]
+                x = x * x
+            return coeffs[0].item()
+        if isinstance(x, ndarray) and coeffs.size > 0 and coeffs.dtype.kind in 'fc':
+            return _horner(x, coeffs)
+        result = numpy.polynomial.polynomial.polyval(x, coeffs)
+        return result.item() if numpy.isscalar(x) else result
 
     def zeroes(self):
         '''Return all the zeroes of the polynomial.'''
-        if self.degree() == 0: #Constant
+        degree = self._deg
+        if degree == 0: #Constant
             if self.coefficients[0] == 0:
                 return REAL_NUMBERS
             else:
                 return []
-        elif self.degree() == 1: #Linear polynomial
+        elif degree == 1: #Linear polynomial
             return [(self.coefficients[0] * -1) / self.coefficients[1]]
-        elif self.degree() == 2: #Quadratic polynomial
+        elif degree == 2: #Quadratic polynomial
             return quadraticformula(self.coefficients[2], self.coefficients[1],
                                     self.coefficients[0])
-        else: #Higher degree polynomial
-            return numpy.roots(self.coefficients).tolist()
+        elif degree == 3: #Cubic polynomial: closed form beats eigensolving
+            return _cubicroots(self.coefficients[3], self.coefficients[2],
+                               self.coefficients[1], self.coefficients[0])
+        elif degree == 4: #Quartic polynomial: closed form beats eigensolving
+            return _quarticroots(self.coefficients[4], self.coefficients[3],
+                                 self.coefficients[2], self.coefficients[1],
+                                 self.coefficients[0])
+        else: #Higher degree polynomial: companion-matrix eigenvalues
+            #numpy.roots wants the highest-degree coefficient first
+            return numpy.roots(self._arr[::-1]).tolist()
         
     def derivative(self):
         '''Return the derivative of the polynomial.'''
@@ -67,21 +235,25 @@ class polynomial(object):
 
     def __str__(self):
         '''Return a string representation of the polynomial.'''
+        #Walk from the highest degree down and append, rather than
+        #insert(0, ...) which shifts the whole list on every term
         terms = []
-        for i, coeff in enumerate(self.coefficients):
+        coefficients = self.coefficients
+        for i in range(len(coefficients) - 1, -1, -1):
+            coeff = coefficients[i]
             if coeff != 0:
                 if i == 0:
-                    terms.insert(0, f'{coeff}')
+                    terms.append(f'{coeff}')
                 elif i == 1:
                     if coeff == 1:
-                        terms.insert(0, 'x')
+                        terms.append('x')
                     else:
-                        terms.insert(0, f'{coeff}x')
+                        terms.append(f'{coeff}x')
                 else:
                     if coeff == 1:
-                        terms.insert(0, f'x^{i}')
+                        terms.append(f'x^{i}')
                     else:
-                        terms.insert(0, f'{coeff}x^{i}')
+                        terms.append(f'{coeff}x^{i}')
         if not terms:
             return '0'
         return ' + '.join(terms).replace('+ -', '- ')
@@ -93,45 +265,80 @@ class polynomial(object):
         '''Add two polynomials.'''
         if not isinstance(other, polynomial):
             raise TypeError('can only add polynomials to polynomials')
-        max_degree = max(self.degree(), other.degree())
-        result_coefficients = [0] * (max_degree + 1)
-        for i in range(self.degree() + 1):
-            result_coefficients[i] += self.coefficients[i]
-        for i in range(other.degree() + 1):
-            result_coefficients[i] += other.coefficients[i]
-        return polynomial(result_coefficients)
+        a = self._arr
+        b = other._arr
+        result = numpy.zeros(max(a.size, b.size), dtype=_sumdtype(a, b))
+        result[:a.size] = a
+        result[:b.size] += b
+        return polynomial(result.tolist())
 
     def __sub__(self, other):
         '''Subtract two polynomials.'''
         if not isinstance(other, polynomial):
             raise TypeError('can only subtract polynomials from polynomials')
-        max_degree = max(self.degree(), other.degree())
-        result_coefficients = [0] * (max_degree + 1)
-        for i in range(self.degree() + 1):
-            result_coefficients[i] += self.coefficients[i]
-        for i in range(other.degree() + 1):
-            result_coefficients[i] -= other.coefficients[i]
-        return polynomial(result_coefficients)
+        a = self._arr
+        b = other._arr
+        result = numpy.zeros(max(a.size, b.size), dtype=_sumdtype(a, b))
+        result[:a.size] = a
+        result[:b.size] -= b
+        return polynomial(result.tolist())
 
     def __mul__(self, other):
-        '''Multiplie two polynomials.'''
+        '''Multiply two polynomials.'''
         if not isinstance(other, polynomial):
             raise TypeError('can only multiply polynomials by polynomials')
-        result_coefficients = [0] * (self.degree() + other.degree() + 1)
-        for i in range(self.degree() + 1):
-            for j in range(other.degree() + 1):
-                result_coefficients[i + j] += self.coefficients[i] * other.coefficients[j]
-        return polynomial(result_coefficients)
+        a = self._arr
+        b = other._arr
+        length = a.size + b.size - 1
+        if a.dtype.kind in 'biu' and b.dtype.kind in 'biu' and a.size and b.size:
+            #The FFT path cannot round-trip coefficients past float64's
+            #53-bit mantissa, and the convolve/Karatsuba paths wrap at
+            #int64 (Karatsuba's folded middle products reach 4x the plain
+            #bound, hence the margin). Check the product bound
+            #max|a| * max|b| * overlap with Python ints and route at-risk
+            #multiplications through exact object-dtype convolution, the
+            #same path oversized inputs already use
+            limit = 1 << 53 if length >= _FFT_MULTIPLY_THRESHOLD else 1 << 61
+            if _intproductbound(a, b) >= limit:
+                result = numpy.convolve(a.astype(object), b.astype(object))
+                return polynomial(result.tolist())
+        if length < _KARATSUBA_MULTIPLY_THRESHOLD or a.dtype.kind not in 'biuf' \
+        or b.dtype.kind not in 'biuf':
+            #Small products (and exotic dtypes) go through NumPy's C convolution
+            result = numpy.convolve(a, b)
+        elif length < _FFT_MULTIPLY_THRESHOLD:
+            #Medium products: Karatsuba beats both plain convolution and the
+            #FFT's constant factor in this band
+            result = _karatsuba(a, b)
+        else:
+            #Large products: multiply pointwise in the frequency domain for
+            #O(n log n) instead of O(n*m)
+            size = 1 << (length - 1).bit_length()
+            result = numpy.fft.irfft(numpy.fft.rfft(a, size) * numpy.fft.rfft(b, size), size)[:length]
+            if a.dtype.kind in 'biu' and b.dtype.kind in 'biu':
+                #Both inputs were integers, so snap the FFT round-off back
+                result = numpy.rint(result).astype(numpy.int64)
+        return polynomial(result.tolist())
 
     def __neg__(self):
         '''Return the negation of the polynomial.'''
-        return polynomial([-c for c in self.coefficients])
+        return polynomial((-self._arr).tolist())
 
 
 #___Matrices and Linear Algebra
+def _as_array(vector):
+    '''Helper function: Coerce a vector-like object to a NumPy array,
+    fast-pathing inputs that are already NumPy and walking linked lists
+    only once.'''
+    if isinstance(vector, ndarray):
+        return vector
+    if isinstance(vector, (linklist, dlinklist)):
+        return array(vector.pylist())
+    return array(vector)
+
 class matrix(object):
     '''Represents a mathematical matrix.'''
-    def __init__(self, data):
+    def __init__(self, data, dtype = numpy.float64):
         if isinstance(data, (list, linklist, dlinklist)):
             if not all(isinstance(row, (list, linklist, dlinklist, ndarray)) for row in data):
                 raise TypeError('all elements in data must be lists, linked lists, or NumPy arrays')
@@ -144,6 +351,14 @@ class matrix(object):
             self.data = data
         else:
             raise TypeError('data must be a list, linked list, or NumPy array')
+        #Standardize on C-contiguous float64 (or the requested dtype) once,
+        #so the BLAS/LAPACK wrappers underneath inv/det/eig/qr/@ never have
+        #to allocate and convert a copy per call. Complex input promotes to
+        #complex128 - still contiguous and BLAS-friendly - instead of
+        #silently dropping the imaginary part into the float64 default
+        if self.data.dtype.kind == 'c' and numpy.dtype(dtype).kind != 'c':
+            dtype = numpy.complex128
+        self.data = numpy.ascontiguousarray(self.data, dtype=dtype)
 
     def __str__(self):
         '''Return a string representation of the matrix.'''
@@ -200,18 +415,18 @@ class matrix(object):
     def __mul__(self, other):
         if isinstance(other, matrix):
             #Matrix multiplication
-            if self.data.shape[1] != other.data.shape[0] or \
-            other.data.shape[1] != self.data.shape[0]:
+            if self.data.shape[1] != other.data.shape[0]:
                 raise ValueError('number of columns in the first matrix must equal the number of rows in the second matrix')
             return matrix(self.data @ other.data)
         elif isinstance(other, (int, float)):
             #Scalar multiplication
             return matrix(self.data * other)
-        elif isinstance(other, (list, linklist, dlinklist)):
-            #Matrix multiplication by vector
-            if self.data.shape[1] != len(other):
+        elif isinstance(other, (list, linklist, dlinklist, ndarray)):
+            #Matrix multiplication by vector (BLAS GEMV via @)
+            vector = _as_array(other)
+            if self.data.shape[1] != vector.shape[0]:
                 raise ValueError('number of columns in the matrix must match the length of the vector')
-            return matrix(self.data @ array(other))
+            return matrix(self.data @ vector)
         else:
             raise TypeError('can only multiply matrices by other matrices, scalars, or vectors')
         
@@ -227,19 +442,21 @@ class matrix(object):
         '''Swap two rows in the matrix.'''
         if row1 < 0 or row1 >= len(self.data) or row2 < 0 or row2 >= len(self.data):
             raise IndexError('invalid row indices')
-        self.data[row1], self.data[row2] = self.data[row2], self.data[row1]
+        #Fancy indexing copies, unlike a tuple swap of two views into the
+        #same buffer
+        self.data[[row1, row2]] = self.data[[row2, row1]]
 
     def scalerow(self, row, factor):
         '''Multiply a row by a scalar.'''
         if row < 0 or row >= len(self.data):
             raise IndexError('invalid row index')
-        self.data[row] = [factor * x for x in self.data[row]]
+        self.data[row] *= factor
 
     def addrows(self, row1, row2, factor):
         '''Add a multiple of one row to another.'''
         if row1 < 0 or row1 >= len(self.data) or row2 < 0 or row2 >= len(self.data):
             raise IndexError('invalid row indices')
-        self.data[row2] = [self.data[row2][i] + factor * self.data[row1][i] for i in range(len(self.data[0]))]
+        self.data[row2] += factor * self.data[row1]
 
     def invert(self):
         '''Matrix inversion.'''
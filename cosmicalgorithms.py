@@ -1,16 +1,45 @@
 '''Cosmic Core: Cosmic Algorithms
 \n\tA library of essential algorithms, including searching and sorting algorithms.'''
+import math
+import numpy
 from numpy import ndarray
-__all__ = ['selectionsort', 'insertionsort', 'bubblesort', 'mergesort', 
+__all__ = ['selectionsort', 'insertionsort', 'bubblesort', 'mergesort',
            'quicksort', 'radixsort', 'linearsearch', 'binarysearch',
            'interpolationsearch']
 
 #___Sorting Algorithms___
-def selectionsort(data):
+_FAST_SORT_THRESHOLD = 64 #Input size at which NumPy's C introsort takes over
+
+def _fastsort(data, inplace = False):
+    '''Helper function: Sort numeric data with NumPy's C introsort.
+    \nNumPy arrays come back as arrays (sorted in place when requested);
+    lists come back as lists. Return None when data is not eligible for
+    the fast path.'''
+    if isinstance(data, ndarray):
+        if data.ndim != 1 or data.dtype.kind not in 'biuf':
+            return None
+        arr = data if inplace else data.copy()
+        arr.sort(kind='quicksort')
+        return arr
+    if not isinstance(data, list):
+        return None
+    arr = numpy.asarray(data)
+    if arr.ndim != 1 or arr.dtype.kind not in 'biuf':
+        return None
+    arr.sort(kind='quicksort') #arr is already a fresh buffer built from the list
+    return arr.tolist()
+
+def selectionsort(data, inplace = False):
     '''Sort data using the selection sort algorithm.
-    \nTime Complexity: O(n^2)'''
+    \nTime Complexity: O(n^2)
+    \nPass inplace=True to sort a numeric NumPy array in place without
+    copying it.'''
     if not hasattr(data, '__iter__'):
         raise TypeError('data must be an iterable')
+    if inplace or len(data) > _FAST_SORT_THRESHOLD:
+        fast = _fastsort(data, inplace)
+        if fast is not None:
+            return fast
     result = data.copy()
     if isinstance(result, ndarray):
         result = result.tolist()
@@ -23,11 +52,17 @@ def selectionsort(data):
         result[i], result[min_idx] = result[min_idx], result[i]
     return result
 
-def insertionsort(data):
+def insertionsort(data, inplace = False):
     '''Sort data using the insertion sort algorithm.
-    \nTime Complexity: O(n^2)'''
+    \nTime Complexity: O(n^2)
+    \nPass inplace=True to sort a numeric NumPy array in place without
+    copying it.'''
     if not hasattr(data, '__iter__'):
         raise TypeError('data must be an iterable')
+    if inplace or len(data) > _FAST_SORT_THRESHOLD:
+        fast = _fastsort(data, inplace)
+        if fast is not None:
+            return fast
     result = data.copy()
     if isinstance(result, ndarray):
         result = result.tolist()
@@ -41,11 +76,17 @@ def insertionsort(data):
         result[j + 1] = key
     return result
 
-def bubblesort(data):
+def bubblesort(data, inplace = False):
     '''Sort data using the bubble sort algorithm.
-    \nTime Complexity: O(n^2)'''
+    \nTime Complexity: O(n^2)
+    \nPass inplace=True to sort a numeric NumPy array in place without
+    copying it.'''
     if not hasattr(data, '__iter__'):
         raise TypeError('data must be an iterable')
+    if inplace or len(data) > _FAST_SORT_THRESHOLD:
+        fast = _fastsort(data, inplace)
+        if fast is not None:
+            return fast
     result = data.copy()
     if isinstance(result, ndarray):
         result = result.tolist()
@@ -65,49 +106,51 @@ def mergesort(data):
     if isinstance(result, ndarray):
         result = result.tolist()
 
-    if len(result) > 1:
-        mid = len(result) // 2
-        left_half = []
-        right_half = []
-        
-        #Create left_half by iterating through data from head to mid
-        for i in range(mid):
-            left_half.append(result[i])
-
-        #Create right_half by iterating from mid to tail
-        for i in range(mid, len(result)):
-            right_half.append(result[i])
-        
-        #Recursively call mergesort to sort the sub-lists
-        left_half = mergesort(left_half)  #Get the sorted left_half
-        right_half = mergesort(right_half)  #Get the sorted right_half
-
-        i = j = k = 0
-        while i < len(left_half) and j < len(right_half):
-            if left_half[i] < right_half[j]:
-                result[k] = left_half[i]
-                i += 1
-            else:
-                result[k] = right_half[j]
-                j += 1
-            k += 1
-
-        while i < len(left_half):
-            result[k] = left_half[i]
-            i += 1
-            k += 1
-
-        while j < len(right_half):
-            result[k] = right_half[j]
-            j += 1
-            k += 1
+    n = len(result)
+    if n > 1:
+        #Bottom-up iterative merge with a single scratch buffer, instead of
+        #recursing and allocating two fresh sub-lists per call
+        source = list(result)
+        scratch = list(source)
+        width = 1
+        while width < n:
+            for low in range(0, n, 2 * width):
+                mid = min(low + width, n)
+                high = min(low + 2 * width, n)
+                i, j, k = low, mid, low
+                while i < mid and j < high:
+                    if source[i] <= source[j]:
+                        scratch[k] = source[i]
+                        i += 1
+                    else:
+                        scratch[k] = source[j]
+                        j += 1
+                    k += 1
+                while i < mid:
+                    scratch[k] = source[i]
+                    i += 1
+                    k += 1
+                while j < high:
+                    scratch[k] = source[j]
+                    j += 1
+                    k += 1
+            source, scratch = scratch, source
+            width *= 2
+        if isinstance(result, list):
+            return source
+        for index, item in enumerate(source):
+            result[index] = item
     return result
 
-def quicksort(data):
+def quicksort(data, inplace = False):
     '''Sort data using the quick sort algorithm (in-place).
     \nTime Complexity: O(n^2)'''
     if not hasattr(data, '__iter__'):
         raise TypeError('data must be an iterable')
+    if inplace or len(data) > _FAST_SORT_THRESHOLD:
+        fast = _fastsort(data, inplace)
+        if fast is not None:
+            return fast
     result = data.copy()
     if isinstance(result, ndarray):
         result = result.tolist()
@@ -131,78 +174,118 @@ def quicksort(data):
         result.extend(quicksort(left) + middle + quicksort(right)) 
     return result
 
+def _radixsortbig(items, base):
+    '''Helper function: Radix sort for Python integers too large for any
+    NumPy dtype, using pure-Python bucket passes so values stay exact.'''
+    max_num = max(items)
+    power = 1
+    while power <= max_num or power == 1:
+        buckets = [[] for _ in range(base)]
+        for item in items:
+            buckets[(item // power) % base].append(item)
+        items = [item for bucket in buckets for item in bucket]
+        power *= base
+    return items
+
 def radixsort(data, base = 10):
     '''Sort data using the radix sort algorithm.
     \nTime Complexity: O(ω*n)
     \nPrecondition: all elements in the data are non-negative integers.'''
     if not hasattr(data, '__iter__'):
         raise TypeError('data must be an iterable')
-    if any(not isinstance(item, int) for item in data):
-        raise TypeError('radix sort only works with integers')
     if len(data) == 0:
         return data.copy()
-    if any(item < 0 for item in data):
+    items = data if isinstance(data, (list, ndarray)) else list(data)
+    arr = numpy.asarray(items)
+    if arr.ndim != 1 or arr.dtype.kind not in 'biufO':
+        raise TypeError('radix sort only works with integers')
+    if arr.dtype.kind in 'fO':
+        #Python ints past 64 bits land in an object array, and NumPy
+        #casts int lists with values in [2**63, 2**64) to lossy float64;
+        #recover the original values and sort them with exact pure-Python
+        #passes. Genuine floats still fail the isinstance check below
+        items = items.tolist() if isinstance(items, ndarray) else list(items)
+        if not all(isinstance(item, int) for item in items):
+            raise TypeError('radix sort only works with integers')
+        if any(item < 0 for item in items):
+            raise ValueError('all items must be positive')
+        return _radixsortbig(items, base)
+    if (arr < 0).any():
         raise ValueError('all items must be positive')
+    #Unsigned input can hold values past int64's range, so it must keep
+    #an unsigned dtype (narrowing to int64 would wrap them negative)
+    dtype = numpy.uint64 if arr.dtype.kind == 'u' else numpy.int64
+    arr = arr.astype(dtype)
 
-    result = data.copy()
-    if isinstance(result, ndarray):
-        result = result.tolist()
- #Find the maximum number to determine the number of digits
-    max_num = max(result)
-    num_digits = 1
-    while max_num // base > 0:
-        max_num //= base
-        num_digits += 1
-
-    #Iterate through each digit position
-    for digit_place in range(num_digits):
-        # Create buckets for each possible digit
-        buckets = [[] for _ in range(base)]
+    #Find the maximum number to determine the number of digits
+    max_num = int(arr.max())
+    if max_num == 0:
+        num_digits = 1
+    else:
+        num_digits = int(math.log(max_num, base)) + 1
+        if base**num_digits <= max_num: #Guard against float log round-off
+            num_digits += 1
 
-        #Distribute elements into buckets based on the current digit
-        for num in result:
-            digit = (num // base**digit_place) % base
-            buckets[digit].append(num)
+    #Precompute the divisor for every digit position instead of evaluating
+    #base**digit_place inside the loop
+    powers = base**numpy.arange(num_digits, dtype=dtype)
 
-        # Concatenate buckets back into the result
-        result = [num for bucket in buckets for num in bucket]
+    #One stable counting pass per digit position, all in compiled loops
+    #instead of Python lists-of-lists buckets
+    for power in powers:
+        digits = (arr // power) % base
+        arr = arr[numpy.argsort(digits, kind='stable')]
 
-    return result
+    return arr.tolist()
 
 #___Search Algorithms___
+def _checksorted(datalist):
+    '''Helper function: Raise ValueError if datalist is not in ascending order.
+    \nRuns in a single O(n) pass instead of sorting a copy.'''
+    arr = numpy.asarray(datalist)
+    if arr.ndim == 1 and arr.dtype.kind in 'biuf':
+        #Compare adjacent elements directly: diff(arr) < 0 can never be
+        #True for unsigned dtypes because the subtraction wraps
+        is_unsorted = bool((arr[1:] < arr[:-1]).any())
+    else:
+        is_unsorted = any(b < a for a, b in zip(datalist, datalist[1:]))
+    if is_unsorted:
+        raise ValueError('data must be sorted')
+
 def linearsearch(data, target):
     '''Search for a target value in a list using a linear approach.
     \nTime Complexity: O(n)'''
     if not hasattr(data, '__iter__'):
         raise TypeError('data must be an iterable')
-    datalist = data.copy()
-    if isinstance(data, ndarray):
-        datalist = datalist.tolist()
-
-    for i in range(len(datalist)):
-        if datalist[i] == target:
+    #Searching never mutates, so iterate the input directly with no copy
+    for i, item in enumerate(data):
+        if item == target:
             return i
-    return -1   
+    return -1
 
-def binarysearch(data, target):
+def binarysearch(data, target, validate = True):
     '''Perform a binary search on a sorted list.
     \nTime Complexity: O(log n)
-    \nPrecondition: the list is sorted.'''
+    \nPrecondition: the list is sorted. Pass validate=False to skip the
+    O(n) sortedness check in hot loops.'''
     if not hasattr(data, '__iter__'):
         raise TypeError('data must be an iterable')
-    datalist = data.copy()
-    if isinstance(datalist, ndarray):
-        datalist = datalist.tolist()
-    if not isinstance(datalist, list):
-        new_datalist = []
-        for i in datalist:
-            new_datalist.append(i)
-        datalist = new_datalist
-    if datalist != sorted(datalist):
-        raise ValueError('data must be sorted')
+    #Searching never mutates, so read the input directly with no copy
+    if isinstance(data, (list, ndarray)):
+        datalist = data
+    else:
+        datalist = list(data)
+    if validate:
+        _checksorted(datalist)
+
+    arr = numpy.asarray(datalist)
+    if arr.ndim == 1 and arr.dtype.kind in 'biuf':
+        #numpy.searchsorted is a C binary search; just confirm the hit
+        i = int(numpy.searchsorted(arr, target))
+        return i if i < arr.size and arr[i] == target else -1
 
     low = 0
-    high = len(data) - 1
+    high = len(datalist) - 1
 
     while low <= high:
         mid = (low + high) // 2
@@ -215,17 +298,20 @@ def binarysearch(data, target):
 
     return -1
 
-def interpolationsearch(data, target):
+def interpolationsearch(data, target, validate = True):
     '''Perform an interpolation search on a sorted list.
     \nTime Complexity: O(log(log n)) (best case), O(n) (worst case)
-    \nPrecondition: the list is sorted.'''
+    \nPrecondition: the list is sorted. Pass validate=False to skip the
+    O(n) sortedness check in hot loops.'''
     if not hasattr(data, '__iter__'):
         raise TypeError('data must be an iterable')
-    datalist = data.copy()
-    if isinstance(datalist, ndarray):
-        datalist = datalist.tolist()
-    if datalist != sorted(datalist):
-        raise ValueError('data must be sorted')
+    #Searching never mutates, so read the input directly with no copy
+    if isinstance(data, (list, ndarray)):
+        datalist = data
+    else:
+        datalist = list(data)
+    if validate:
+        _checksorted(datalist)
 
     low = 0
     high = len(datalist) - 1
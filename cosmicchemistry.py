@@ -4,15 +4,50 @@ from .cosmicdatabases import *
 from .cosmicdatastructures import *
 from .cosmicmath import *
 from .cosmicstrings import capitalizefirstletter
+from functools import lru_cache
 from numpy import ndarray
 import os
 import re
-__all__ = ['getchemicalname', 'getchemicalsymbol', 'gramstomoles', 
-           'molestograms', 'molestoparticles', 'particlestomoles', 
-           'gramstoparticles', 'particlestograms','getmolarmass', 'substance', 
+import sqlite3
+import threading
+__all__ = ['getchemicalname', 'getchemicalsymbol', 'gramstomoles',
+           'molestograms', 'molestoparticles', 'particlestomoles',
+           'gramstoparticles', 'particlestograms','getmolarmass', 'substance',
            'reaction']
 DB_LOCATION = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cosmicchemistry.db')
 
+#The chemistry database is read-only reference data, so keep one connection
+#open per thread instead of reconnecting for every lookup.
+_local = threading.local()
+
+def _getdb():
+    '''Helper function: Return this thread's cached connection to the
+    chemistry database, opening it on first use.'''
+    connection = getattr(_local, 'connection', None)
+    if connection is None:
+        #cached_statements keeps the compiled form of every query this
+        #module runs, so repeated lookups skip the SQL parse/plan step
+        connection = sqlite3.connect(DB_LOCATION, check_same_thread=False,
+                                     cached_statements=128)
+        connection.execute('PRAGMA query_only = 1')
+        connection.execute('PRAGMA cache_size = -8000')
+        connection.execute('PRAGMA temp_store = MEMORY')
+        _local.connection = connection
+    return connection
+
+#The periodic table is tiny (118 rows) and read-only, so load it once at
+#import and answer every element lookup from these dicts instead of SQL.
+#Values are (atomic_number, symbol, name, atomic_mass) rows.
+_ELEMENTS_BY_SYMBOL = {}
+_ELEMENTS_BY_NAME = {}
+_ELEMENTS_BY_NUMBER = {}
+for _row in _getdb().execute(
+        'SELECT atomic_number, symbol, name, atomic_mass FROM elements'):
+    _ELEMENTS_BY_SYMBOL[_row[1]] = _row
+    _ELEMENTS_BY_NAME[_row[2].lower()] = _row
+    _ELEMENTS_BY_NUMBER[_row[0]] = _row
+del _row
+
 
 # ___Chemical Naming___
 def getchemicalname(symbol):
@@ -20,28 +55,18 @@ def getchemicalname(symbol):
     if not isinstance(symbol, str):
         raise TypeError('symbol must be a string')
     
+    # 1. Check the preloaded elements table
+    element = _ELEMENTS_BY_SYMBOL.get(symbol)
+    if element:
+        return element[2]  # Return the element name
+
     try:
-        with sqlitedb(DB_LOCATION) as db:
-            # 1. Check elements table
-            query = 'SELECT name FROM elements WHERE symbol = ?'
-            db.query(query, (symbol,))
-            result = db.fetchone()
-            if result:
-                return result[0]  # Return the element name
-
-            # 2. Check compounds table (common_name)
-            query = 'SELECT common_name FROM compounds WHERE formula = ?'
-            db.query(query, (symbol,))
-            result = db.fetchone()
-            if result and result[0]:  # Check if common_name exists and is not NULL
-                return result[0]  # Return the common name
-
-            # 3. Check compounds table (iupac_name)
-            query = 'SELECT iupac_name FROM compounds WHERE formula = ?'
-            db.query(query, (symbol,))
-            result = db.fetchone()
-            if result and result[0]:  # Check if iupac_name exists and is not NULL
-                return result[0]  # Return the IUPAC name
+        # 2. Check compounds table, fetching both names in one round trip
+        # and preferring the common name when it is not NULL
+        query = 'SELECT common_name, iupac_name FROM compounds WHERE formula = ?'
+        result = _getdb().execute(query, (symbol,)).fetchone()
+        if result:
+            return result[0] or result[1]
 
         return None # Not in the database
 
@@ -54,23 +79,20 @@ def getchemicalsymbol(name):
     if not isinstance(name, str):
         raise TypeError('name must be a string')
 
+    # 1. Check the preloaded elements table (names are stored lowercase)
+    element = _ELEMENTS_BY_NAME.get(name)
+    if element:
+        return element[1]
+
     try:
-        with sqlitedb(DB_LOCATION) as db:
-            # 1. Check elements table
-            query = 'SELECT symbol FROM elements WHERE name = ?'
-            db.query(query, (name,))  # Name is already lowercase (see previous implementation)
-            result = db.fetchone()
-            if result:
-                return result[0]
-
-            # 2. Check compounds table (common_name)
-            query = 'SELECT formula FROM compounds WHERE common_name = ? OR iupac_name = ?'
-            db.query(query, (name, name))
-            result = db.fetchone()
-            if result:
-                return result[0]
-
-            return None  # Not found in the database
+        db = _getdb()
+        # 2. Check compounds table (common_name)
+        query = 'SELECT formula FROM compounds WHERE common_name = ? OR iupac_name = ?'
+        result = db.execute(query, (name, name)).fetchone()
+        if result:
+            return result[0]
+
+        return None  # Not found in the database
 
     except Exception as e:
         print(f'Database lookup error: {e}') # Log the error if you have a logger
@@ -122,95 +144,132 @@ def particlestograms(substance, particles):
 
 
 # ___Tools For Setting Up Chemical Compounds__
+#Compile the validation regex once at import rather than on every call
+_FORMULA_PATTERN = re.compile(r'^[A-Za-z0-9()+\-\.\s]+$')
+
 def _compoundtolist(compound):
-    '''Convert a chemical formula into a list of elements and quantities.'''
+    '''Convert a chemical formula into a list of elements and quantities.
+    \nThe formula grammar (symbol, optional count, parentheses) is simple
+    enough that a hand-written index scanner beats re-entering the regex
+    engine for every token.'''
     if not isinstance(compound, str):
         raise TypeError('compound must be a string')
 
-    # Updated regex to handle parentheses and charges
-    pattern = re.compile(r'([A-Z][a-z]*)(\d*)|(\()|(\))(\d*)')
     complist = []
-    for match in pattern.finditer(compound):
-        element, quantity, open_paren, close_paren, paren_quantity = match.groups()
-
-        if element:
-            complist.append(element)
-            if quantity:
-                complist.append(quantity)
-            else:
-                complist.append('1')
-        elif open_paren:
-            complist.append(open_paren)
-        elif close_paren:
-            complist.append(close_paren)
-            if paren_quantity:
-                complist.append(paren_quantity)
-            else:
-                complist.append('1')  #default it to '1' if none is present
+    append = complist.append
+    i = 0
+    n = len(compound)
+    while i < n:
+        char = compound[i]
+        if 'A' <= char <= 'Z':
+            #Element symbol: one uppercase letter plus trailing lowercase
+            j = i + 1
+            while j < n and 'a' <= compound[j] <= 'z':
+                j += 1
+            append(compound[i:j])
+            #Quantity: the digit run after the symbol, defaulting to '1'
+            k = j
+            while k < n and '0' <= compound[k] <= '9':
+                k += 1
+            append(compound[j:k] if k > j else '1')
+            i = k
+        elif char == '(':
+            append('(')
+            i += 1
+        elif char == ')':
+            append(')')
+            j = i + 1
+            while j < n and '0' <= compound[j] <= '9':
+                j += 1
+            append(compound[i + 1:j] if j > i + 1 else '1')
+            i = j
+        else:
+            i += 1 #Skip charges, dots, and whitespace, as the regex did
     return complist
 
+def _atomicmass(symbol):
+    '''Helper function: Return the atomic mass of an element symbol, or None
+    if it is not an element. Answered from the preloaded periodic table.'''
+    element = _ELEMENTS_BY_SYMBOL.get(symbol)
+    return element[3] if element else None
+
 def getmolarmass(compound):
     '''Return the molar mass of a substance with a known chemical formula.'''
 
     if isinstance(compound, list):
-        complist = compound
+        return _tokensmass(compound)
     elif isinstance(compound, str):
-        complist = _compoundtolist(compound)
+        return _molarmass(compound)
     else:
         raise TypeError('compound must be a string or a list')
-    
-    molar_mass = 0.0
-    in_parentheses = False
-    parentheses_start = 0
-    parentheses_end = 0
-    for i in range(0, len(complist)):
-        add_to_mass = 0.0
-        if not in_parentheses:
-            if isinstance(complist[i], int) or isinstance(complist[i], float):
-                pass
-            elif isinstance(complist[i], str) and complist[i].isnumeric():
+
+@lru_cache(maxsize=1024)
+def _molarmass(formula):
+    '''Helper function: Memoized molar mass of a formula string, so repeat
+    lookups of the same formula skip tokenization and parsing entirely.'''
+    return _tokensmass(_compoundtolist(formula))
+
+def _tokensmass(complist):
+    '''Helper function: Compute the molar mass of a token list produced by
+    _compoundtolist (or supplied by the caller).'''
+    #Single left-to-right pass with an explicit stack of running subtotals:
+    #'(' pushes a fresh subtotal and ')' pops it, scales it by its quantity
+    #and folds it into the enclosing level. No recursion, no list slicing.
+    def quantity_after(i):
+        '''Return the quantity token following position i, defaulting to 1.'''
+        if i + 1 < len(complist):
+            nxt = complist[i + 1]
+            if isinstance(nxt, (int, float)):
+                return int(nxt)
+            if isinstance(nxt, str) and nxt.isnumeric():
+                return int(nxt)
+        return 1
+
+    stack = [0.0]
+    try:
+        for i in range(0, len(complist)):
+            token = complist[i]
+            if isinstance(token, (int, float)):
+                pass #Quantities are consumed alongside their element or group
+            elif isinstance(token, str) and token.isnumeric():
                 pass
-            elif complist[i].isalpha():
-                element_symbol = complist[i]
-                try:
-                    with sqlitedb(DB_LOCATION) as db:
-                        query = 'SELECT atomic_mass FROM elements WHERE symbol = ?'
-                        db.query(query, (element_symbol,))
-                        result = db.fetchone()
-                        if result:
-                            atomic_mass = result[0]
-                            try:
-                                if isinstance(complist[i + 1], int) or isinstance(complist[i + 1], float):
-                                    add_to_mass = float(atomic_mass) * int(complist[i + 1])
-                                elif isinstance(complist[i + 1], str) and complist[i + 1].isnumeric():
-                                    add_to_mass = float(atomic_mass) * int(complist[i + 1])
-                            except:
-                                pass
-                        else:
-                            raise ValueError(f'element symbol not found in database: {element_symbol}')
-                except Exception as e:
-                    if isinstance(e, ValueError):
-                        raise e
-                    print(f'Database lookup error: {e}')
-                    return None # Handle database errors gracefully
-            elif complist[i] == '(':
-                parentheses_start = i
-                in_parentheses = True
-        else:
-            add_to_mass = 0.0
-            if complist[i] == ')':
-                parentheses_end = i
-                in_parentheses = False
-                add_to_mass = getmolarmass(complist[parentheses_start + 1:parentheses_end])
-                try:
-                    if isinstance(complist[i + 1], int) or isinstance(complist[i + 1], float):
-                        add_to_mass *= int(complist[i + 1])
-                    elif isinstance(complist[i + 1], str) and complist[i + 1].isnumeric():
-                        add_to_mass *= int(complist[i + 1])
-                except:
-                    pass
-        molar_mass += add_to_mass
-    return molar_mass
+            elif token == '(':
+                stack.append(0.0)
+            elif token == ')':
+                if len(stack) == 1:
+                    raise ValueError('unbalanced parentheses in formula')
+                group_mass = stack.pop()
+                stack[-1] += group_mass * quantity_after(i)
+            elif isinstance(token, str) and token.isalpha():
+                atomic_mass = _atomicmass(token)
+                if atomic_mass is None:
+                    raise ValueError(f'element symbol not found in database: {token}')
+                stack[-1] += float(atomic_mass) * quantity_after(i)
+    except ValueError:
+        raise
+    except Exception as e:
+        print(f'Database lookup error: {e}')
+        return None # Handle database errors gracefully
+    return stack[0]
+
+
+@lru_cache(maxsize=1024)
+def _resolveformula(formula):
+    '''Helper function: Resolve a formula string to a
+    (substance_type, id, name, molar_mass) tuple, checking the compounds
+    table, then the preloaded elements, then falling back to a computed
+    molar mass. Memoized so repeat substance() construction for the same
+    formula does no database work.'''
+    query = 'SELECT pubchem_cid, common_name, iupac_name FROM compounds WHERE formula = ?'
+    result = _getdb().execute(query, (formula,)).fetchone()
+    if result:
+        #Prefer the common name, falling back to the IUPAC name
+        return ('compound', result[0], result[1] or result[2], _molarmass(formula))
+    element = _ELEMENTS_BY_SYMBOL.get(formula)
+    if element:
+        return ('element', element[0], element[2], element[3])
+    #Not in the database; assume it is a compound and compute the mass
+    return ('compound', None, None, _molarmass(formula))
 
 
 #__Chemistry Classes__
@@ -228,85 +287,53 @@ class substance(object):
             raise ValueError('id_type must be \'formula\', \'atomic_number\', or \'pubchem_cid\'')
 
         try:  # Wrap all database interaction in a try block
-            with sqlitedb(DB_LOCATION) as db:  # Use the sqlitedb context manager
-                if id_type == 'atomic_number':
-                    if not isinstance(identifier, int):
-                        raise TypeError('identifier must be an integer for atomic_number')
-                    if not 1 <= identifier <= 118:
-                        raise ValueError('atomic number must be between 1 and 118')
-
-                    query = 'SELECT symbol, name, atomic_mass FROM elements WHERE atomic_number = ?'
-                    db.query(query, (identifier,))
-                    result = db.fetchone()
-
-                    if result:
-                        self.substance_type = 'element'
-                        self.id = identifier
-                        self.formula = result[0]  # Element Symbol
-                        self.name = result[1]
-                        self.molar_mass = result[2]
-                    else:
-                        raise ValueError(f'element with atomic number {identifier} not found')
-
-                elif id_type == 'pubchem_cid':
-                    if not isinstance(identifier, int):
-                        raise TypeError('identifier must be an integer for pubchem_cid')
-
-                    query = 'SELECT formula, common_name, iupac_name FROM compounds WHERE pubchem_cid = ?'
-                    db.query(query, (identifier,))
-                    result = db.fetchone()
-
-                    if result:
-                        self.substance_type = 'compound'
-                        self.id = identifier
-                        self.formula = result[0]
-                        if result[1]:
-                            self.name = result[1] # Common name is not NULL
-                        else:
-                            self.name = result[2] #Use IUPAC name if common name is NULL
-                        self.molar_mass = getmolarmass(self.formula)  # Calculate molar mass
+            db = _getdb()
+            if id_type == 'atomic_number':
+                if not isinstance(identifier, int):
+                    raise TypeError('identifier must be an integer for atomic_number')
+                if not 1 <= identifier <= 118:
+                    raise ValueError('atomic number must be between 1 and 118')
+
+                element = _ELEMENTS_BY_NUMBER.get(identifier)
+                if element:
+                    self.substance_type = 'element'
+                    self.id = identifier
+                    self.formula = element[1]  # Element Symbol
+                    self.name = element[2]
+                    self.molar_mass = element[3]
+                else:
+                    raise ValueError(f'element with atomic number {identifier} not found')
+
+            elif id_type == 'pubchem_cid':
+                if not isinstance(identifier, int):
+                    raise TypeError('identifier must be an integer for pubchem_cid')
+
+                query = 'SELECT formula, common_name, iupac_name FROM compounds WHERE pubchem_cid = ?'
+                result = db.execute(query, (identifier,)).fetchone()
+
+                if result:
+                    self.substance_type = 'compound'
+                    self.id = identifier
+                    self.formula = result[0]
+                    if result[1]:
+                        self.name = result[1] # Common name is not NULL
                     else:
-                        raise ValueError(f'compound with PubChem CID {identifier} not found.')
-
-                elif id_type == 'formula':
-                    if not isinstance(identifier, str):
-                        raise TypeError('identifier must be a string for formula')
-
-                    # Validate the formula
-                    if not re.match(r'^[A-Za-z0-9()+\-\.\s]+$', identifier):
-                        raise ValueError('invalid chemical formula format')
-
-                    query = 'SELECT pubchem_cid, common_name, iupac_name FROM compounds WHERE formula = ?'
-                    db.query(query, (identifier,))
-                    result = db.fetchone()
-
-                    if result:
-                        self.substance_type = 'compound'
-                        self.id = result[0] #PubChem CID
-                        self.formula = identifier  # Store the formula
-                        if result[1]:
-                            self.name = result[1] #Common name is not NULL
-                        else:
-                            self.name = result[2] #Use IUPAC Name if common name is NULL
-                        self.molar_mass = getmolarmass(self.formula)  # Calculate molar mass
-                    else:  # Treat as an element lookup as a fallback, with atomic mass from elements table
-                        query = 'SELECT atomic_number, name, atomic_mass FROM elements WHERE symbol = ?'
-                        db.query(query, (identifier,))
-                        result = db.fetchone()
-
-                        if result:
-                            self.substance_type = 'element'
-                            self.id = result[0]
-                            self.formula = identifier  # Element symbol
-                            self.name = result[1]
-                            self.molar_mass = result[2]
-                        else:
-                            # The substance is not in the database, it will be assumed to be a compound
-                            self.substance_type = 'compound'
-                            self.id = None
-                            self.formula = identifier
-                            self.name is None
-                            self.molar_mass = getmolarmass(self.formula)
+                        self.name = result[2] #Use IUPAC name if common name is NULL
+                    self.molar_mass = getmolarmass(self.formula)  # Calculate molar mass
+                else:
+                    raise ValueError(f'compound with PubChem CID {identifier} not found.')
+
+            elif id_type == 'formula':
+                if not isinstance(identifier, str):
+                    raise TypeError('identifier must be a string for formula')
+
+                # Validate the formula
+                if not _FORMULA_PATTERN.match(identifier):
+                    raise ValueError('invalid chemical formula format')
+
+                (self.substance_type, self.id, self.name,
+                 self.molar_mass) = _resolveformula(identifier)
+                self.formula = identifier  # Store the formula
 
         except Exception as e:
             raise e
@@ -314,48 +341,40 @@ class substance(object):
     
     def iselement(self):
         '''Return True if the substance is an element, False otherwise.'''
-        try:
-            with sqlitedb(DB_LOCATION) as db:
-                query = 'SELECT COUNT(*) FROM elements WHERE symbol = ?'
-                db.query(query, (self.formula,))
-                result = db.fetchone()
-                return result[0] > 0  # Returns True if a matching element exists
-        except Exception as e:
-            print(f'Database error in iselement: {e}')
-            return False  # Handle database error (return False as a safe default)
+        return self.formula in _ELEMENTS_BY_SYMBOL
     
     def getelements(self):
         '''Returns a list of the constituent elements in a chemical compound.'''
         try:
-            with sqlitedb(DB_LOCATION) as db:
-                query = '''
-                    SELECT DISTINCT e.symbol
-                    FROM compound_elements ce
-                    JOIN elements e ON ce.atomic_number = e.atomic_number
-                    JOIN compounds c ON ce.pubchem_cid = c.pubchem_cid
-                    WHERE c.formula = ?
-                '''
-                db.query(query, (self.formula,))
-                results = db.fetchall()
-                elements = [row[0] for row in results]  # Extract element symbols from the results
-                if elements:  # If elements were found in compound_elements, return them
-                    return elements
-                else: #If it wasn't found, then let's use parsing from _compoundtolist()
-                    parsed_formula = _compoundtolist(self.formula)
-                    elements = []
-                    for element in parsed_formula:
-                        if element.isalpha() and not element in elements:
-                            elements.append(element)
-                    return elements
+            query = '''
+                SELECT DISTINCT e.symbol
+                FROM compound_elements ce
+                JOIN elements e ON ce.atomic_number = e.atomic_number
+                JOIN compounds c ON ce.pubchem_cid = c.pubchem_cid
+                WHERE c.formula = ?
+            '''
+            results = _getdb().execute(query, (self.formula,)).fetchall()
+            elements = [row[0] for row in results]  # Extract element symbols from the results
+            if elements:  # If elements were found in compound_elements, return them
+                return elements
+            else: #If it wasn't found, then let's use parsing from _compoundtolist()
+                return self._parseelements()
         except Exception as e:
             print(f'Database error in getelements: {e}')
             #Parsing from _compoundtolist() now as a final fallback
-            parsed_formula = _compoundtolist(self.formula)
-            elements = []
-            for element in parsed_formula:
-                if element.isalpha() and not element in elements:
-                    elements.append(element)
-            return elements
+            return self._parseelements()
+
+    def _parseelements(self):
+        '''Helper method: Extract the unique element symbols from the parsed
+        formula, in first-appearance order. A set tracks what has been seen,
+        so membership checks stay O(1) instead of rescanning the list.'''
+        seen = set()
+        elements = []
+        for element in _compoundtolist(self.formula):
+            if element.isalpha() and element not in seen:
+                seen.add(element)
+                elements.append(element)
+        return elements
 
     def ishydrocarbon(self):
         '''Return True if the substance is a hydrocarbon, False otherwise.'''
@@ -1,6 +1,8 @@
 '''Cosmic Core: Cosmic Console
 \n\tA library of functions designed to enhance console output.'''
+import functools
 import os
+import sys
 import ctypes
 __all__ = ['printcclogo', 'printunorderedlist', 'printorderedlist', 'ansibold',
            'ansiitalic', 'ansiunderline', 'ansiblink', 'ansicolor',
@@ -47,38 +49,64 @@ def printunorderedlist(data, bullet = '•', indent = 0):
     if not isinstance(indent, int) or indent < 0:
         raise ValueError('indent must be a non-negative integer')
     
+    #Collect every line first and emit one write, instead of a print (and
+    #potential flush) per item
+    lines = []
+    _collectunorderedlist(data, bullet, indent, lines)
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+def _collectunorderedlist(data, bullet, indent, lines):
+    '''Helper function: Append the rendered lines of an unordered list
+    (recursing into nested iterables) onto the shared lines list.'''
     indent_str = ' ' * indent
 
     for item in data:
         if hasattr(item, '__iter__') and not isinstance(item, str):
-            # If the item is an iterable (but not a string), call printunorderedlist recursively
-            print(f'{indent_str}{bullet}')
-            printunorderedlist(item, bullet, indent + 2)
+            # If the item is an iterable (but not a string), recurse deeper
+            lines.append(f'{indent_str}{bullet}')
+            _collectunorderedlist(item, bullet, indent + 2, lines)
         else:
-            print(f'{indent_str}{bullet} {str(item)}')
+            lines.append(f'{indent_str}{bullet} {str(item)}')
 
 def printorderedlist(data, start_num = 1, indent = 0):
     '''Display an iterable to the console as an ordered list.'''
     if not hasattr(data, '__iter__'):
         raise TypeError('data must be an iterable')
-    
+
     if not isinstance(start_num, int) or start_num <= 0:
         raise ValueError('start_num must be a positive integer')
-    
+
     if not isinstance(indent, int) or indent < 0:
         raise ValueError('indent must be a non-negative integer')
-    
+
     indent_str = ' ' * indent
-    
-    num = start_num
-    for item in data:
-        print(f'{indent_str}{num}. {str(item)}')
-        num += 1
+
+    lines = [f'{indent_str}{num}. {str(item)}'
+             for num, item in enumerate(data, start_num)]
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
 
 
 #__ANSI Formatting (Not supported on all systems)__
+_TEXT_COLORS = {'black':'30', 'red':'31', 'green':'32', 'yellow':'33',
+                'blue':'34', 'magenta':'35', 'cyan':'36', 'white':'37',
+                'bright black':'90', 'bright red':'91', 'bright green':'92',
+                'bright yellow':'93', 'bright blue':'94',
+                'bright magenta':'95', 'bright cyan':'96',
+                'bright white':'97'}
+_BG_COLORS = {'black':'40', 'red':'41', 'green':'42', 'yellow':'43',
+              'blue':'44', 'magenta':'45', 'cyan':'46', 'white':'47',
+              'bright black':'100', 'bright red':'101', 'bright green':'102',
+              'bright yellow':'103', 'bright blue':'104',
+              'bright magenta':'105','bright cyan':'106',
+              'bright white':'107'}
+
+@functools.cache
 def _hasansisupport():
-    '''Check if the system supports ANSI escape codes.'''
+    '''Check if the system supports ANSI escape codes.
+    \nThe answer cannot change while the process runs, so it is computed once
+    and cached; every ansi* call was previously re-probing the console.'''
     if os.name != 'nt':
         # Non-Windows systems generally support ANSI escape codes
         return True
@@ -109,40 +137,32 @@ def ansiblink(text):
 
 def ansicolor(text, color = 'white'):
     '''Give a string color using ANSI escape codes (Support varies).'''
-    TEXT_COLORS = {'black':'30', 'red':'31', 'green':'32', 'yellow':'33',
-                   'blue':'34', 'magenta':'35', 'cyan':'36', 'white':'37',
-                   'bright black':'90', 'bright red':'91', 'bright green':'92',
-                   'bright yellow':'93', 'bright blue':'94', 
-                   'bright magenta':'95', 'bright cyan':'96', 
-                   'bright white':'97'}
-    
     if not isinstance(color, str):
         raise TypeError('color must be a str')
-    
-    if color.lower() not in TEXT_COLORS:
+
+    if color.lower() not in _TEXT_COLORS:
         raise ValueError('invalid color')
-    
-    return f'\x1b[{TEXT_COLORS.get(color)}m{text}\x1b[39m' if _hasansisupport() else text
+
+    return f'\x1b[{_TEXT_COLORS.get(color)}m{text}\x1b[39m' if _hasansisupport() else text
 
 def ansibgcolor(text, color = 'black'):
     '''Give a string a background color using ANSI escape codes (Support varies).'''
-    BG_COLORS = {'black':'40', 'red':'41', 'green':'42', 'yellow':'43',
-                'blue':'44', 'magenta':'45', 'cyan':'46', 'white':'47',
-                'bright black':'100', 'bright red':'101', 'bright green':'102',
-                'bright yellow':'103', 'bright blue':'104',
-                'bright magenta':'105','bright cyan':'106',
-                'bright white':'107'}
-    
     if not isinstance(color, str):
         raise TypeError('color must be a str')
-    
-    if color.lower() not in BG_COLORS:
+
+    if color.lower() not in _BG_COLORS:
         raise ValueError('invalid color')
-    
-    return f'\x1b[{BG_COLORS.get(color)}m{text}\x1b[49m' if _hasansisupport() else text
+
+    return f'\x1b[{_BG_COLORS.get(color)}m{text}\x1b[49m' if _hasansisupport() else text
 
 
 #__Cleanup__
 def clearconsole():
     'Clear the console.'
-    os.system('cls' if os.name == 'nt' else 'clear')
\ No newline at end of file
+    if _hasansisupport():
+        #Clear screen and home the cursor with one escape write, instead of
+        #forking a subprocess (and a shell on Windows) via os.system
+        sys.stdout.write('\x1b[2J\x1b[H')
+        sys.stdout.flush()
+    else:
+        os.system('cls' if os.name == 'nt' else 'clear')
\ No newline at end of file
@@ -13,28 +13,57 @@ from cryptography.hazmat.primitives import serialization
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat, PrivateFormat
-from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15, OAEP
+from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15, OAEP, MGF1
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.padding import PKCS7
 from cryptography.hazmat.primitives.asymmetric import utils
 
 import hashlib
+import numpy
+import queue
+import threading
 
+from functools import lru_cache
 from os import urandom
+from string import ascii_lowercase, ascii_uppercase
 __all__ = ['caesarencrypt', 'caesardecrypt', 'aesencrypt', 'aesdecrypt',
-           'blowfishencrypt', 'blowfishdecrypt', 'rsagenkey', 'rsaencrypt',
-           'rsadecrypt', 'sha256', 'sha512', 'md5']
+           'blowfishencrypt', 'blowfishdecrypt', 'rsagenkey', 'rsakeypool',
+           'rsaencrypt',
+           'rsadecrypt', 'sha256', 'sha512', 'md5', 'sha256file']
 
 #___Caesar Cipher___
+@lru_cache(maxsize=26)
+def _caesartable(shift):
+    '''Helper function: Build (and cache) the translation table mapping every
+    ASCII letter to its Caesar-shifted counterpart.'''
+    shifted_lower = ascii_lowercase[shift:] + ascii_lowercase[:shift]
+    shifted_upper = ascii_uppercase[shift:] + ascii_uppercase[:shift]
+    return str.maketrans(ascii_lowercase + ascii_uppercase,
+                         shifted_lower + shifted_upper)
+
+def _caesarbytes(data, shift):
+    '''Helper function: Caesar-shift ASCII letters in a bytes-like object
+    using vectorized NumPy arithmetic, one compiled pass per mask instead of
+    a Python-level loop. Non-letter bytes pass through unchanged.'''
+    buf = numpy.frombuffer(data, dtype=numpy.uint8)
+    #Branchless letter test: OR with 0x20 folds both cases to lowercase, and
+    #uint8 wrap-around makes (folded - 97) land below 26 only for letters
+    offset = (buf | numpy.uint8(0x20)) - numpy.uint8(97)
+    isalpha = offset < 26
+    #Add the rotation delta back onto the original byte; uint8 arithmetic is
+    #exact mod 256, so case is preserved without a second mask pass
+    shifted = buf + ((offset + numpy.uint8(shift)) % 26 - offset)
+    return numpy.where(isalpha, shifted, buf).tobytes()
+
 def caesarencrypt(text, shift):
-    '''Encrypt text using a Caesar cipher with the given shift.'''
-    result = ''
-    for char in text:
-        if char.isalpha():
-            start = ord('a') if char.islower() else ord('A')
-            shifted_char = chr((ord(char) - start + shift) % 26 + start)
-        else:
-            shifted_char = char
-        result += shifted_char
-    return result
+    '''Encrypt text using a Caesar cipher with the given shift.
+    \nAccepts str or bytes-like input; bytes go through a vectorized NumPy
+    kernel, which suits batch call sites such as brute-forcing shifts.'''
+    if isinstance(text, (bytes, bytearray, memoryview)):
+        return _caesarbytes(text, shift % 26)
+    #str.translate applies the whole table in a single C-level pass instead
+    #of doing ord/chr arithmetic per character in the interpreter
+    return text.translate(_caesartable(shift % 26))
 
 def caesardecrypt(text, shift):
     '''Decrypt text encrypted with a Caesar cipher.'''
@@ -42,119 +71,173 @@ def caesardecrypt(text, shift):
 
 
 #___Symmetric Encryption___
-def aesencrypt(key, plaintext, associated_data=None):
-    '''Encrypt plaintext using AES in CBC mode.'''
-    backend = default_backend()
-    if associated_data is None:
-        associated_data = b''
-
-    #Pad the plaintext to a multiple of 16 bytes
-    padding_length = 16 - (len(plaintext.encode('utf-8')) % 16)
-    plaintext = plaintext + (chr(padding_length) * padding_length)
+@lru_cache(maxsize=32)
+def _aescipher(key, iv):
+    '''Helper function: Build (and cache) an AES-CBC Cipher for a key/IV
+    pair. Reusing the Cipher keeps the expanded AES key schedule across
+    calls; encryptor()/decryptor() contexts stay cheap and per-call.'''
+    return Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
+
+@lru_cache(maxsize=32)
+def _blowfishcipher(key, mode, iv):
+    '''Helper function: Build (and cache) a Blowfish Cipher for a key, mode
+    class, and IV. Blowfish's key schedule is notoriously expensive, so
+    reuse matters even more than for AES.'''
+    return Cipher(Blowfish(key), mode(iv), backend=default_backend())
+
+def _runcipher(context, data, block_size):
+    '''Helper function: Run data through a cipher context with update_into,
+    writing into one preallocated buffer instead of having the library
+    allocate a fresh output bytestring per call.'''
+    buffer = bytearray(len(data) + block_size) #update_into needs block slack
+    written = context.update_into(data, buffer)
+    return bytes(memoryview(buffer)[:written]) + context.finalize()
 
-    cipher = Cipher(algorithms.AES(key), modes.CBC(bytes(16)), backend=backend)
-    encryptor = cipher.encryptor()
-    ciphertext = encryptor.update(plaintext.encode('utf-8')) + encryptor.finalize()
-    if associated_data:
-        ciphertext = encryptor.update(associated_data) + encryptor.finalize()
+def aesencrypt(key, plaintext, associated_data=None):
+    '''Encrypt plaintext using AES in CBC mode.
+    \nassociated_data is accepted for API compatibility but unused: CBC is
+    not an authenticated mode and cannot bind extra data.'''
+    #PKCS7 padding on the encoded bytes, so multi-byte UTF-8 characters
+    #cannot throw off the block alignment
+    padder = PKCS7(algorithms.AES.block_size).padder()
+    padded = padder.update(plaintext.encode('utf-8')) + padder.finalize()
 
-    return ciphertext
+    encryptor = _aescipher(bytes(key), bytes(16)).encryptor()
+    return _runcipher(encryptor, padded, 16)
 
 def aesdecrypt(key, ciphertext, associated_data=None):
-    '''Decrypt ciphertext encrypted with AES in CBC mode.'''
-    backend = default_backend()
-    if associated_data is None:
-        associated_data = b''
-
-    cipher = Cipher(algorithms.AES(key), modes.CBC(bytes(16)), backend=backend)
-    decryptor = cipher.decryptor()
-    plaintext = decryptor.update(ciphertext) + decryptor.finalize()
-    if associated_data:
-        plaintext = decryptor.update(associated_data) + decryptor.finalize()
-
-    #Remove padding
-    plaintext = plaintext.decode('utf-8')  #Decode to string first
-    padding_length = ord(plaintext[-1])
-    plaintext = plaintext[:-padding_length]
-
-    return plaintext
+    '''Decrypt ciphertext encrypted with AES in CBC mode.
+    \nassociated_data is accepted for API compatibility but unused: CBC is
+    not an authenticated mode and cannot bind extra data.'''
+    decryptor = _aescipher(bytes(key), bytes(16)).decryptor()
+    padded = _runcipher(decryptor, ciphertext, 16)
+
+    #Strip the PKCS7 padding before decoding back to a string
+    unpadder = PKCS7(algorithms.AES.block_size).unpadder()
+    plaintext = unpadder.update(padded) + unpadder.finalize()
+    return plaintext.decode('utf-8')
 
 def blowfishencrypt(key, plaintext, mode=modes.CBC, iv=None):
     '''Encrypt plaintext using Blowfish in CBC mode.'''
-    backend = default_backend()
     if iv is None:
         iv = bytes(8)
 
-    #Pad the plaintext to a multiple of 8 bytes
-    padding_length = 8 - (len(plaintext.encode('utf-8')) % 8)
-    plaintext = plaintext + (chr(padding_length) * padding_length)
+    #Pad the encoded bytes to Blowfish's 8-byte block size
+    padder = PKCS7(Blowfish.block_size).padder()
+    padded = padder.update(plaintext.encode('utf-8')) + padder.finalize()
 
-    cipher = Cipher(Blowfish(key), mode(iv), backend=backend)
-    encryptor = cipher.encryptor()
-    ciphertext = encryptor.update(plaintext.encode('utf-8')) + encryptor.finalize()
-    return ciphertext
+    encryptor = _blowfishcipher(bytes(key), mode, bytes(iv)).encryptor()
+    return _runcipher(encryptor, padded, 8)
 
 def blowfishdecrypt(key, ciphertext, mode=modes.CBC, iv=None):
     '''Decrypt ciphertext encrypted with Blowfish in CBC mode.'''
-    backend = default_backend()
     if iv is None:
         iv = bytes(8)
 
-    cipher = Cipher(Blowfish(key), mode(iv), backend=backend)
-    decryptor = cipher.decryptor()
-    plaintext = decryptor.update(ciphertext) + decryptor.finalize()
-
-    #Remove padding
-    plaintext = plaintext.decode('utf-8')
-    padding_length = ord(plaintext[-1])
-    plaintext = plaintext[:-padding_length]
+    decryptor = _blowfishcipher(bytes(key), mode, bytes(iv)).decryptor()
+    padded = _runcipher(decryptor, ciphertext, 8)
 
-    return plaintext
+    #Strip the PKCS7 padding before decoding back to a string
+    unpadder = PKCS7(Blowfish.block_size).unpadder()
+    plaintext = unpadder.update(padded) + unpadder.finalize()
+    return plaintext.decode('utf-8')
 
 
 #___Asymmetric Encryption___
-def rsagenkey():
-    '''Generate a new RSA key pair.'''
+#Opt-in pool of pre-generated key pairs; see rsakeypool below
+_rsa_pool = None
+
+def _rsagenerate():
+    '''Helper function: Synchronously generate one RSA-2048 key pair.'''
     private_key = rsa.generate_private_key(
         public_exponent=65537,
         key_size=2048,
         backend=default_backend()
     )
-    public_key = private_key.public_key()
-    return private_key, public_key
+    return private_key, private_key.public_key()
+
+def _fillrsapool():
+    '''Helper function: Background worker that keeps the key pool topped up.
+    \nQueue.put blocks while the pool is full, so the thread sleeps until a
+    key is taken.'''
+    while True:
+        _rsa_pool.put(_rsagenerate())
+
+def rsakeypool(size = 4):
+    '''Start pre-generating RSA key pairs in a background thread, so that
+    subsequent rsagenkey calls return a ready-made pair instantly instead of
+    spending ~100 ms generating primes. Opt-in; call once, keeping up to
+    size pairs buffered.'''
+    if not isinstance(size, int) or size <= 0:
+        raise ValueError('size must be a positive integer')
+    global _rsa_pool
+    if _rsa_pool is None:
+        _rsa_pool = queue.Queue(maxsize=size)
+        threading.Thread(target=_fillrsapool, daemon=True).start()
+
+def rsagenkey():
+    '''Generate a new RSA key pair.
+    \nIf rsakeypool has been called, a pre-generated pair is returned when
+    one is ready; otherwise the pair is generated on the spot.'''
+    if _rsa_pool is not None:
+        try:
+            return _rsa_pool.get_nowait()
+        except queue.Empty:
+            pass #Pool is still generating; fall back to synchronous
+    return _rsagenerate()
+
+def _oaep():
+    '''Helper function: The OAEP padding used to wrap session keys.'''
+    return OAEP(mgf=MGF1(algorithm=hashes.SHA256()),
+                algorithm=hashes.SHA256(), label=None)
 
 def rsaencrypt(public_key, plaintext):
-    '''Encrypt plaintext using an RSA public key.'''
-    ciphertext = public_key.encrypt(
-        plaintext.encode('utf-8'),
-        PKCS1v15()
-    )
-    return ciphertext
+    '''Encrypt plaintext of any length using an RSA public key.
+    \nHybrid scheme: a random 256-bit AES key encrypts the payload with
+    AES-GCM, and only that key is wrapped with RSA-OAEP. This removes the
+    ~245-byte RSA message limit and keeps the bulk work on the fast AES
+    path.'''
+    session_key = urandom(32)
+    wrapped_key = public_key.encrypt(session_key, _oaep())
+    nonce = urandom(12)
+    ciphertext = AESGCM(session_key).encrypt(nonce, plaintext.encode('utf-8'), None)
+    return wrapped_key + nonce + ciphertext
 
 def rsadecrypt(private_key, ciphertext):
-    '''Decrypt ciphertext using an RSA private key.'''
-    plaintext = private_key.decrypt(
-        ciphertext,
-        PKCS1v15()
-    )
-    return plaintext.decode('utf-8')
+    '''Decrypt ciphertext produced by rsaencrypt using an RSA private key.'''
+    #The wrapped session key is always exactly one RSA modulus long
+    key_bytes = private_key.key_size // 8
+    wrapped_key = ciphertext[:key_bytes]
+    nonce = ciphertext[key_bytes:key_bytes + 12]
+    payload = ciphertext[key_bytes + 12:]
+    session_key = private_key.decrypt(wrapped_key, _oaep())
+    return AESGCM(session_key).decrypt(nonce, payload, None).decode('utf-8')
 
 
 #___Hashing Algorithms___
+def _tobytes(data):
+    '''Helper function: Encode str data to UTF-8 bytes; pass bytes-like data
+    (bytes, bytearray, memoryview) straight through without copying.'''
+    if isinstance(data, str):
+        return data.encode('utf-8')
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return data
+    raise TypeError('data must be a string or bytes-like object')
+
 def sha256(data):
-    '''Calculate the SHA-256 hash of the given data.'''
-    sha256 = hashlib.sha256()
-    sha256.update(data.encode('utf-8'))
-    return sha256.hexdigest()
+    '''Calculate the SHA-256 hash of the given data (str or bytes-like).'''
+    return hashlib.sha256(_tobytes(data)).hexdigest()
 
 def sha512(data):
-    '''Calculate the SHA-512 hash of the given data.'''
-    sha512 = hashlib.sha512()
-    sha512.update(data.encode('utf-8'))
-    return sha512.hexdigest()
+    '''Calculate the SHA-512 hash of the given data (str or bytes-like).'''
+    return hashlib.sha512(_tobytes(data)).hexdigest()
 
 def md5(data):
-    '''Calculate the MD5 hash of the given data.'''
-    md5 = hashlib.md5()
-    md5.update(data.encode('utf-8'))
-    return md5.hexdigest()
\ No newline at end of file
+    '''Calculate the MD5 hash of the given data (str or bytes-like).'''
+    return hashlib.md5(_tobytes(data)).hexdigest()
+
+def sha256file(path):
+    '''Calculate the SHA-256 hash of a file without reading it into memory
+    all at once.'''
+    with open(path, 'rb') as file:
+        return hashlib.file_digest(file, 'sha256').hexdigest()
\ No newline at end of file
@@ -1,6 +1,9 @@
 '''Cosmic Core: Cosmic Data Structures
 \n\tA library of basic data structures, including stacks, queues, lists, and trees.'''
-from numpy import array, ndarray
+import heapq
+import itertools
+from collections import deque
+from numpy import array, array_equal, count_nonzero, ndarray, unique
 from .cosmicalgorithms import *
 __all__ = ['node', 'dlnode', 'tnode', 'pnode', 'chain', 'dlchain', 'bag',
            'stack', 'queue', 'priorityqueue', 'linklist', 'dlinklist', 'tree']
@@ -10,6 +13,10 @@ __all__ = ['node', 'dlnode', 'tnode', 'pnode', 'chain', 'dlchain', 'bag',
 class node(object):
     '''Represents a singly linked node.'''
 
+    #Fixed-offset attribute storage: no per-node __dict__, so nodes are
+    #roughly half the size and attribute loads skip the dict lookup
+    __slots__ = ('data', 'next')
+
     def __init__(self, data, next = None):
         self.data = data
         self.next = next
@@ -17,6 +24,8 @@ class node(object):
 class dlnode(node):
     '''Represents a doubly linked node.'''
 
+    __slots__ = ('prev',)
+
     def __init__(self, data, next = None, prev = None):
         super().__init__(data, next)
         self.prev = prev
@@ -24,6 +33,8 @@ class dlnode(node):
 class pnode(node):
     '''Represents a singly linked node with a priority assigned to it.'''
 
+    __slots__ = ('priority',)
+
     def __init__(self, data, next = None, priority = 0):
         super().__init__(data, next)
         if not isinstance(priority, int):
@@ -32,6 +43,9 @@ class pnode(node):
 
 class tnode(object):
     '''Represents a node in a general tree.'''
+
+    __slots__ = ('data', 'children', 'max_children', 'parent')
+
     def __init__(self, data, children = None, max_children = None, parent = None):
         self.data = data
         if not isinstance(max_children, int) and max_children is not None:
@@ -54,7 +68,9 @@ class tnode(object):
         '''Add new child to the node.'''
         if self.max_children is not None and len(self.children) >= self.max_children:
             raise ValueError('maximum number of children per node reached')
-        self.children.append(tnode(item, [], self.max_children, self))
+        child = tnode(item, [], self.max_children, self)
+        self.children.append(child)
+        return child
     
     def pop(self, i):
         '''Remove and return the child at position i.'''
@@ -108,12 +124,19 @@ class tnode(object):
 class chain(object):
     '''A template for linked chain-based data structures.'''
 
+    #Node class threaded by _buildfromiterable; doubly linked subclasses
+    #override this with dlnode
+    _nodetype = node
+
     def __init__(self, source_collection = None):
         '''Set the initial state of self, which includes the
         contents of sourceCollection, if it's present.'''
 
         self.head = self.tail = None
         self.size = 0
+        #Lazily built NumPy snapshot of the items (see _getsnap); None
+        #marks it stale, False marks the items as non-numeric
+        self._snap = None
         
         if source_collection is not None:
             for i in source_collection:
@@ -132,12 +155,31 @@ class chain(object):
         
         self.tail = new_node
         self.size += 1
+        self._snap = None
 
     def clear(self):
         '''Make self become empty.'''
         
         self.head = self.tail = None
         self.size = 0
+        self._snap = None
+
+    def _getsnap(self): #Helper method
+        '''Helper method: Return a contiguous NumPy snapshot of self's
+        items, rebuilt lazily after mutations, or None when the items are
+        not homogeneous numeric (the vectorized paths need a real numeric
+        dtype).'''
+        snap = self._snap
+        if snap is None:
+            try:
+                arr = array(list(self))
+            except ValueError:
+                arr = None
+            if arr is not None and arr.ndim == 1 and arr.dtype.kind in 'biufc':
+                snap = self._snap = arr
+            else:
+                snap = self._snap = False
+        return snap if snap is not False else None
 
     def copy(self):
         '''Return a copy of self.'''
@@ -155,21 +197,45 @@ class chain(object):
             
         return self.size == 0
     
+    @classmethod
+    def _buildfromiterable(cls, iterable):
+        '''Helper method: Build a new instance by creating every node in
+        one list comprehension and wiring the links in a tight loop,
+        instead of paying a full add() call per item. Only valid for
+        chains whose add appends at the tail; head-inserting subclasses
+        override __add__ instead.'''
+        new_chain = cls()
+        nodes = [cls._nodetype(x) for x in iterable]
+        if not nodes:
+            return new_chain
+        for i in range(len(nodes) - 1):
+            nodes[i].next = nodes[i + 1]
+        if issubclass(cls._nodetype, dlnode):
+            for i in range(1, len(nodes)):
+                nodes[i].prev = nodes[i - 1]
+        new_chain.head = nodes[0]
+        new_chain.tail = nodes[-1]
+        new_chain.size = len(nodes)
+        return new_chain
+
     def __add__(self, other):
         '''Return a new instance of the type of self
         containing the contents of self and other.'''
         
-        new_chain = type(self)(self)
         if isinstance(other, (list, tuple, set, chain)):
-            new_chain.extend(other)
-        else:
-            new_chain.add(other)
-        return new_chain
+            return self._buildfromiterable(itertools.chain(self, other))
+        return self._buildfromiterable(itertools.chain(self, (other,)))
     
     def __contains__(self, item):
         '''Return True if self contains the item, False otherwise.'''
+        if isinstance(item, (bool, int, float, complex)):
+            snap = self._getsnap()
+            if snap is not None:
+                #One SIMD compare sweep over the snapshot instead of a
+                #Python-level pointer chase through the nodes
+                return bool((snap == item).any())
         cur_node = self.head
-        while cur_node != None:
+        while cur_node is not None:
             if cur_node.data == item:
                 return True
             cur_node = cur_node.next
@@ -187,9 +253,14 @@ class chain(object):
         if len(self) != len(other):
             return False
         
+        snap = self._getsnap()
+        other_snap = other._getsnap()
+        if snap is not None and other_snap is not None:
+            return array_equal(snap, other_snap)
+        
         cur_self_node = self.head
         cur_other_node = other.head
-        while cur_self_node != None and cur_other_node != None:
+        while cur_self_node is not None and cur_other_node is not None:
             if cur_self_node.data != cur_other_node.data:
                 return False
             cur_self_node = cur_self_node.next
@@ -201,7 +272,7 @@ class chain(object):
         '''Iterate over a view of self.'''
         
         cursor = self.head
-        while cursor != None:
+        while cursor is not None:
             yield cursor.data
             cursor = cursor.next
         
@@ -215,7 +286,7 @@ class chain(object):
         chain_string = ''
         
         cur_node = self.head
-        while cur_node != None:
+        while cur_node is not None:
             chain_string += str(cur_node.data) + ', '
             cur_node = cur_node.next
                     
@@ -229,6 +300,8 @@ class chain(object):
 class dlchain(chain):
     '''A template for doubly linked chain-based data structures.'''
 
+    _nodetype = dlnode
+
     def add(self, item):
         '''Add item to self.'''
         #This function will have varying definitions based on the data type,
@@ -242,7 +315,8 @@ class dlchain(chain):
         
         new_node.prev = self.tail
         self.tail = new_node
-        self.size += 1    
+        self.size += 1
+        self._snap = None
 
 #___Basic Data Structures___
 class bag(chain):
@@ -253,25 +327,25 @@ class bag(chain):
         new_node.next = self.head
         self.head = new_node
         self.size += 1
+        self._snap = None
 
     def count(self, item):
         '''Return the number of instances of the item in the bag.'''
-        count = 0
-        cur_node = self.head
-        while cur_node != None:
-            if cur_node.data == item:
-                count += 1
-            cur_node = cur_node.next
-        return count
+        if isinstance(item, (bool, int, float, complex)):
+            snap = self._getsnap()
+            if snap is not None:
+                return int(count_nonzero(snap == item))
+        #Generator fed to the C-implemented sum(): no Python-level counter
+        return sum(1 for data in self if data == item)
 
     def remove(self, item):
         '''Remove an item from the bag.'''
         cur_node = self.head
-        while cur_node != None:
+        while cur_node is not None:
             if cur_node.data == item:
                 break
             cur_node = cur_node.next
-        if cur_node == None:
+        if cur_node is None:
             raise KeyError(f'{item} is not in the bag')
         
         # swap data to remove with head node data
@@ -281,6 +355,7 @@ class bag(chain):
         self.head = self.head.next
 
         self.size -= 1
+        self._snap = None
 
     def __eq__(self, other):
         '''Return True if self equals other, or False otherwise.'''
@@ -294,6 +369,16 @@ class bag(chain):
         if len(self) != len(other):
             return False
 
+        snap = self._getsnap()
+        other_snap = other._getsnap()
+        if snap is not None and other_snap is not None:
+            #Sort-and-count both sides once (O(n log n)) instead of a
+            #count-per-item rescan (O(n^2))
+            self_values, self_counts = unique(snap, return_counts=True)
+            other_values, other_counts = unique(other_snap, return_counts=True)
+            return (array_equal(self_values, other_values)
+                    and array_equal(self_counts, other_counts))
+
         for i in self:
             if self.count(i) != other.count(i):
                 return False
@@ -308,6 +393,7 @@ class stack(chain):
 
         self.head = self.tail = None
         self.size = 0
+        self._snap = None
         
         if source_collection is not None:
             for i in source_collection:
@@ -319,6 +405,7 @@ class stack(chain):
         new_node.next = self.head
         self.head = new_node
         self.size += 1
+        self._snap = None
 
     def push(self, item):
         '''Add item to the top of the stack.'''
@@ -326,11 +413,12 @@ class stack(chain):
 
     def extend(self, other):
         '''Add the contents of other to self.'''
-        tempstack = stack()
-        for i in other:
-            tempstack.add(i)
-        for j in tempstack:
-            self.add(j)
+        #Materialize once and push in reverse, so the first item of other
+        #ends up deepest - same order as before, without allocating (and
+        #re-iterating) a scratch stack of n extra nodes
+        buf = list(other)
+        for item in reversed(buf):
+            self.add(item)
     
     def peek(self):
         '''Return the item at the top of the stack.
@@ -344,6 +432,18 @@ class stack(chain):
         \nPrecondition: the stack is not empty.'''
         return self.peek()
 
+    def __add__(self, other):
+        '''Return a new instance of the type of self
+        containing the contents of self and other.
+        \nStacks insert at the head, so the tail-threading fast path in
+        chain.__add__ does not apply.'''
+        new_chain = type(self)(self)
+        if isinstance(other, (list, tuple, set, chain)):
+            new_chain.extend(other)
+        else:
+            new_chain.add(other)
+        return new_chain
+
     def pop(self):
         '''Remove and return the item at the top of the stack.
         \nPrecondition: the stack is not empty.
@@ -355,6 +455,7 @@ class stack(chain):
         if self.size == 1:
             self.tail = None
         self.size -= 1
+        self._snap = None
         return backup
 
     def __repr__(self):
@@ -398,6 +499,7 @@ class queue(chain):
         if self.size == 1:
             self.tail = None
         self.size -= 1
+        self._snap = None
         return backup
     
     def dequeue(self):
@@ -411,30 +513,30 @@ class queue(chain):
 
 
 class priorityqueue(queue):
-    '''A link-based priority queue implementation.'''
-    def add(self, item, priority = 0):
-        '''Add an item to the queue with a given priority. Lower numbers have higher priority.'''
-        new_node = pnode(item, priority = priority)
+    '''A bucket-heap priority queue implementation.
+    \nItems are grouped into one FIFO deque per distinct priority, with a
+    binary heap ordering just the distinct priorities. Adding at a
+    priority that already exists is a dict probe plus a deque append -
+    O(1) - and the heap only pays O(log k) for the k distinct priorities,
+    which is tiny for the common few-severity-levels workload. The old
+    sorted-linked-list insertion walk made repeated enqueues O(n^2).'''
 
-        if self.isempty():
-            self.head = self.tail = new_node
-        else:
-            # Insert the new node in the correct position based on priority
-            if self.head.priority > priority:
-                # Insert at the front
-                new_node.next = self.head
-                self.head = new_node
-            else:
-                # Traverse to find the correct position
-                cur_node = self.head
-                while cur_node.next is not None and cur_node.next.priority <= priority:
-                    cur_node = cur_node.next
-                new_node.next = cur_node.next
-                cur_node.next = new_node
-                if new_node.next is None:
-                    self.tail = new_node
+    def __init__(self, source_collection = None):
+        self._heap = []    #Distinct priorities only
+        self._buckets = {} #priority -> deque of items, FIFO within
+        super().__init__(source_collection)
 
+    def add(self, item, priority = 0):
+        '''Add an item to the queue with a given priority. Lower numbers have higher priority.'''
+        if not isinstance(priority, int):
+            raise TypeError('priority must be an int')
+        bucket = self._buckets.get(priority)
+        if bucket is None:
+            bucket = self._buckets[priority] = deque()
+            heapq.heappush(self._heap, priority)
+        bucket.append(item)
         self.size += 1
+        self._snap = None
 
     def push(self, item, priority=0):
         '''Add an item to the queue with a given priority. Lower numbers have higher priority.'''
@@ -444,6 +546,72 @@ class priorityqueue(queue):
         '''Add an item to the queue with a given priority. Lower numbers have higher priority.'''
         self.add(item, priority)
 
+    def peek(self):
+        '''Return the highest-priority item in the queue.
+        \nPrecondition: the queue is not empty.'''
+        if self.isempty():
+            raise KeyError('cannot peek an empty queue')
+        return self._buckets[self._heap[0]][0]
+
+    def pop(self):
+        '''Remove and return the highest-priority item in the queue.
+        \nPrecondition: the queue is not empty.
+        \nPostcondition: the highest-priority item is removed from the queue.'''
+        if self.isempty():
+            raise KeyError('cannot pop an empty queue')
+        priority = self._heap[0]
+        bucket = self._buckets[priority]
+        item = bucket.popleft()
+        if not bucket:
+            #Last item at this priority: retire it from the heap too
+            heapq.heappop(self._heap)
+            del self._buckets[priority]
+        self.size -= 1
+        self._snap = None
+        return item
+
+    def clear(self):
+        '''Make self become empty.'''
+        super().clear()
+        self._heap = []
+        self._buckets = {}
+
+    def __add__(self, other):
+        '''Return a new instance of the type of self
+        containing the contents of self and other.
+        \nItems live in a heap rather than a node chain, so the
+        tail-threading fast path in chain.__add__ does not apply.'''
+        new_chain = type(self)(self)
+        if isinstance(other, (list, tuple, set, chain)):
+            new_chain.extend(other)
+        else:
+            new_chain.add(other)
+        return new_chain
+
+    def __contains__(self, item):
+        '''Return True if self contains the item, False otherwise.'''
+        return any(item in bucket for bucket in self._buckets.values())
+
+    def __eq__(self, other):
+        '''Return True if self equals other, or False otherwise.'''
+        if self is other:
+            return True
+        if type(self) != type(other):
+            return False
+        if len(self) != len(other):
+            return False
+        return list(self) == list(other)
+
+    def __iter__(self):
+        '''Iterate over the items in dequeue order (the priorities are
+        only materialized in sorted order when iterated).'''
+        for priority in sorted(self._heap):
+            yield from self._buckets[priority]
+
+    def __str__(self):
+        '''Return the string representation of self.'''
+        return f"{{{', '.join(str(item) for item in self)}}}"
+
     def __repr__(self):
         return f'priorityqueue({str(self)})'
 
@@ -451,34 +619,51 @@ class priorityqueue(queue):
 class linklist(chain):
     '''A link-based upgrade to the basic list.'''
 
+    def __init__(self, source_collection = None):
+        #Single-level skip index over the chain: one checkpoint node every
+        #_skip_stride positions, built lazily by _getnode and thrown away
+        #(set to None) whenever a mutation moves nodes around. Appends do
+        #not invalidate it; _getnode rebuilds once the list has outgrown
+        #the index by more than 25%.
+        self._skip = None
+        self._skip_stride = 1
+        self._skip_size = 0
+        super().__init__(source_collection)
+
     def add(self, item):
         '''Add item to the end of the list.'''
         super().add(item)
 
+    def clear(self):
+        '''Make self become empty.'''
+        super().clear()
+        self._skip = None
+
     def append(self, item):
         '''Add item to the end of the list.'''
         self.add(item)
     
     def count(self, item):
         '''Return the number of instances of the item in the list.'''
-        
-        count = 0
-
-        cur_node = self.head
-        while cur_node != None:
-            if cur_node.data == item:
-                count += 1
-            cur_node = cur_node.next
-
-        return count
+        if isinstance(item, (bool, int, float, complex)):
+            snap = self._getsnap()
+            if snap is not None:
+                return int(count_nonzero(snap == item))
+        #Generator fed to the C-implemented sum(): no Python-level counter
+        return sum(1 for data in self if data == item)
     
     def index(self, item):
         '''Return the position of item.
         \nPrecondition: item is in the list.'''
-            
-        for i in range(self.size):
-            if self[i] == item:
-                return i
+        #One walk with a counter: no repeated _getnode calls, and the
+        #node attributes are read straight into locals
+        index = 0
+        cur_node = self.head
+        while cur_node is not None:
+            if cur_node.data == item:
+                return index
+            cur_node = cur_node.next
+            index += 1
         raise ValueError(f'{item} is not in list')
     
     def insert(self, i, item):
@@ -509,13 +694,15 @@ class linklist(chain):
             node_before.next = new_node
 
         self.size += 1
+        self._skip = None
+        self._snap = None
     
     def pop(self, i = None):
         '''Remove and return the item at position i.
         \nIf i is None, i is given a default of len(self) - 1.
         \nPrecondition: 0 <= i < len(self).'''
         
-        if i == None:
+        if i is None:
             i = self.size - 1
         
         if i < 0 or i >= self.size:
@@ -532,10 +719,12 @@ class linklist(chain):
 
             prev_node.next = node_to_remove.next
 
-            if node_to_remove.next == None:
+            if node_to_remove.next is None:
                 self.tail = prev_node
       
         self.size -= 1
+        self._skip = None
+        self._snap = None
 
         return backup
     
@@ -545,31 +734,63 @@ class linklist(chain):
         new_node.next = self.head
         self.head = new_node
         self.size += 1
+        self._skip = None
+        self._snap = None
     
     def pylist(self):
         '''Convert the list into the built-in Python list data type.'''
         new_list = []
         cur_node = self.head
-        while cur_node != None:
+        while cur_node is not None:
             new_list.append(cur_node.data)
             cur_node = cur_node.next
         return new_list
    
     def remove(self, item):
-        '''Remove the first instance of the item.'''       
-        to_remove = self.index(item)
-        self.pop(to_remove)
+        '''Remove the first instance of the item.'''
+        #One scan that unlinks in place, instead of an index() walk
+        #followed by a second walk inside pop()
+        prev_node = None
+        cur_node = self.head
+        while cur_node is not None:
+            if cur_node.data == item:
+                if prev_node is None:
+                    self.head = cur_node.next
+                else:
+                    prev_node.next = cur_node.next
+                if cur_node is self.tail:
+                    self.tail = prev_node
+                self.size -= 1
+                self._skip = None
+                self._snap = None
+                return
+            prev_node = cur_node
+            cur_node = cur_node.next
+        raise ValueError(f'{item} is not in list')
 
     def removeall(self, item):
         '''Remove all instances of the item.'''
+        #Single forward pass rewiring prev.next around each match; the old
+        #pop(i)-per-match loop re-walked from the head every removal
+        prev_node = None
         cur_node = self.head
-        i = 0
-        while cur_node != None:
+        removed = 0
+        while cur_node is not None:
             if cur_node.data == item:
-                self.pop(i)
-                i -= 1
+                if prev_node is None:
+                    self.head = cur_node.next
+                else:
+                    prev_node.next = cur_node.next
+                if cur_node is self.tail:
+                    self.tail = prev_node
+                removed += 1
+            else:
+                prev_node = cur_node
             cur_node = cur_node.next
-            i += 1
+        if removed:
+            self.size -= removed
+            self._skip = None
+            self._snap = None
     
     def replace(self, index, item):
         '''Replace the items at the given position with item.
@@ -578,48 +799,86 @@ class linklist(chain):
     
     def reverse(self):
         '''Reverse the order of elements in the list.'''
-        reversed_list = reversed(self)
-        self.clear()
-        self.extend(reversed_list)
+        #Re-assign data through the existing nodes in reverse order; no
+        #node churn, and head/tail (and the skip index) stay valid
+        arr = self.pylist()
+        cur_node = self.head
+        for value in reversed(arr):
+            cur_node.data = value
+            cur_node = cur_node.next
+        self._snap = None
     
     def sort(self, algorithm = None):
         '''Sort the list using one of Cosmic Algorithms's sorting algorithms, or
         Python's built-in sorted() function if one is not provided.'''
+        #Materialize to a plain list once, so the sorting algorithm indexes
+        #a real list instead of paying a node walk per access
+        sortedlist = self.pylist()
         if algorithm is None:
-            sortedlist = sorted(self)
+            sortedlist.sort()
         elif not isinstance(algorithm, str):
             raise TypeError('sorting algorithm must be a string')
         else:
             if algorithm.lower() in ('selection', 'selectionsort', 'selection sort'):
-                sortedlist = selectionsort(self)
+                sortedlist = selectionsort(sortedlist)
             elif algorithm.lower() in ('insertion', 'insertionsort', 'insertion sort'):
-                sortedlist = insertionsort(self)
+                sortedlist = insertionsort(sortedlist)
             elif algorithm.lower() in ('bubble', 'bubblesort', 'bubble sort'):
-                sortedlist = bubblesort(self)
+                sortedlist = bubblesort(sortedlist)
             elif algorithm.lower() in ('merge', 'mergesort', 'merge sort'):
-                sortedlist = mergesort(self)
+                sortedlist = mergesort(sortedlist)
             elif algorithm.lower() in ('quick', 'quicksort', 'quick sort'):
-                sortedlist = quicksort(self)
+                sortedlist = quicksort(sortedlist)
             elif algorithm.lower() in ('radix', 'radixsort', 'radix sort'):
-                sortedlist = radixsort(self)
+                sortedlist = radixsort(sortedlist)
             else:
                 raise ValueError('invalid sorting algorithm')
-        self.clear()
-        self.extend(sortedlist)
+        #Write the sorted values back through the existing nodes instead of
+        #rebuilding the chain with clear() + n add() calls
+        cur_node = self.head
+        for value in sortedlist:
+            cur_node.data = value
+            cur_node = cur_node.next
+        self._snap = None
 
     def _getnode(self, i): #Helper method
-        '''Helper method: Return a pointer to the node at position i.'''
+        '''Helper method: Return a pointer to the node at position i.
+        \nJumps to the nearest skip-index checkpoint at or before i and
+        walks at most a stride's worth of nodes from there, so indexed
+        access costs O(sqrt(n)) instead of O(n) once the index is built.'''
         
         if i < 0 or i >= self.size:
             return None
         
+        skip = self._skip
+        if skip is None or self.size * 4 > self._skip_size * 5:
+            skip = self._buildskip()
+        
+        bucket = i // self._skip_stride
+        if bucket >= len(skip):
+            bucket = len(skip) - 1
+        cur_node = skip[bucket]
+        for _ in range(i - bucket * self._skip_stride):
+            cur_node = cur_node.next
+        
+        return cur_node
+    
+    def _buildskip(self): #Helper method
+        '''Helper method: Walk the chain once, recording a checkpoint node
+        every stride positions, and return the checkpoint list.'''
+        stride = max(16, int(self.size ** 0.5))
+        skip = []
         index = 0
         cur_node = self.head
-        while index < i:
+        while cur_node is not None:
+            if index % stride == 0:
+                skip.append(cur_node)
             cur_node = cur_node.next
             index += 1
-        
-        return cur_node
+        self._skip = skip
+        self._skip_stride = stride
+        self._skip_size = self.size
+        return skip
     
     def __array__(self, dtype=None, copy=None):
         '''Convert the linklist to a NumPy array.'''
@@ -640,10 +899,23 @@ class linklist(chain):
             start, stop, step = i.indices(self.size)
             if start < 0 or stop > self.size or step <= 0:
                 raise IndexError('index out of range')
-            sliced_list = linklist()
-            for index in range(start, stop, step):
-                sliced_list.append(self._getnode(index).data)
-            return sliced_list
+            #Collect in one walk from the head instead of paying a
+            #_getnode traversal per index, which made slicing quadratic
+            items = []
+            append = items.append
+            if start < stop:
+                cur_node = self.head
+                for _ in range(start):
+                    cur_node = cur_node.next
+                index = start
+                while True:
+                    append(cur_node.data)
+                    index += step
+                    if index >= stop:
+                        break
+                    for _ in range(step):
+                        cur_node = cur_node.next
+            return type(self)._buildfromiterable(items)
 
         else:
             raise TypeError('indices must be integers or slices')
@@ -658,6 +930,7 @@ class linklist(chain):
             if i < 0 or i >= self.size:
                 raise IndexError('index out of range')
             self._getnode(i).data = item
+            self._snap = None #Data changed; node positions did not
         else:
             raise TypeError('indices must be integers')
     
@@ -666,7 +939,7 @@ class linklist(chain):
         chain_string = ''
         
         cur_node = self.head
-        while cur_node != None:
+        while cur_node is not None:
             chain_string += str(cur_node.data) + ', '
             cur_node = cur_node.next
                     
@@ -681,7 +954,7 @@ class linklist(chain):
         '''Return a reversed copy of the list.'''
         cur_node = self.head
         reversed_list = linklist()
-        while cur_node != None:
+        while cur_node is not None:
             reversed_list.prepend(cur_node.data)
             cur_node = cur_node.next
         return reversed_list
@@ -689,6 +962,8 @@ class linklist(chain):
 class dlinklist(linklist):
     '''A doubly link-based upgrade to the basic list.'''
 
+    _nodetype = dlnode
+
     def add(self, item):
         '''Add item to the end of the list.'''
         new_node = dlnode(item)
@@ -738,36 +1013,30 @@ class dlinklist(linklist):
             new_node.next.prev = new_node
 
         self.size += 1
+        self._skip = None
+        self._snap = None
     
     def pop(self, i = None):
         '''Remove and return the item at position i.
         \nIf i is None, i is given a default of len(self) - 1.
         \nPrecondition: 0 <= i < len(self).'''
         
-        if i == None:
+        if i is None:
             i = self.size - 1
         
         if i < 0 or i >= self.size:
             raise IndexError('index out of range')
         
-        if i == 0:
-            backup = self.head.data
-            self.head = self.head.next
-            self.head.prev = None
+        #The tail pointer makes the default (pop-the-end) case O(1)
+        if i == self.size - 1:
+            node_to_remove = self.tail
         else:
-            prev_node = self._getnode(i)
-            node_to_remove = prev_node.next
-
-            backup = node_to_remove.data
-
-            prev_node.next = node_to_remove.next
-
-            if node_to_remove.next == None:
-                self.tail = prev_node
-            else:
-                node_to_remove.next.prev = prev_node
-      
+            node_to_remove = self._getnode(i)
+        backup = node_to_remove.data
+        self._unlink(node_to_remove)
         self.size -= 1
+        self._skip = None
+        self._snap = None
 
         return backup
     
@@ -778,6 +1047,22 @@ class dlinklist(linklist):
         self.head.prev = new_node
         self.head = new_node
         self.size += 1
+        self._skip = None
+        self._snap = None
+
+    def _getnode(self, i): #Helper method
+        '''Helper method: Return a pointer to the node at position i,
+        walking backward from the tail when that side is closer.
+        \nThe backward walk only runs when the skip index is cold; a warm
+        index already reaches any position in O(sqrt(n)) going forward.'''
+        if i < 0 or i >= self.size:
+            return None
+        if self._skip is not None or i < self.size // 2:
+            return super()._getnode(i)
+        cur_node = self.tail
+        for _ in range(self.size - 1 - i):
+            cur_node = cur_node.prev
+        return cur_node
 
     def __getitem__(self, i):
         '''Return the item at position i.
@@ -791,17 +1076,52 @@ class dlinklist(linklist):
             return self._getnode(i).data
         
         elif isinstance(i, slice):
-            start, stop, step = i.indices(self.size)
-            if start < 0 or stop > self.size or step <= 0:
-                raise IndexError('index out of range')
-            sliced_list = dlinklist()
-            for index in range(start, stop, step):
-                sliced_list.append(self._getnode(index).data)
-            return sliced_list
+            #Handled by linklist.__getitem__, which builds the result via
+            #type(self) and therefore returns a dlinklist here
+            return super().__getitem__(i)
 
         else:
             raise TypeError('indices must be integers or slices')
 
+    def remove(self, item):
+        '''Remove the first instance of the item.'''
+        cur_node = self.head
+        while cur_node is not None:
+            if cur_node.data == item:
+                self._unlink(cur_node)
+                self.size -= 1
+                self._skip = None
+                self._snap = None
+                return
+            cur_node = cur_node.next
+        raise ValueError(f'{item} is not in list')
+
+    def removeall(self, item):
+        '''Remove all instances of the item.'''
+        cur_node = self.head
+        removed = 0
+        while cur_node is not None:
+            if cur_node.data == item:
+                self._unlink(cur_node)
+                removed += 1
+            cur_node = cur_node.next
+        if removed:
+            self.size -= removed
+            self._skip = None
+            self._snap = None
+
+    def _unlink(self, cur_node): #Helper method
+        '''Helper method: Splice a node out of the chain, fixing both the
+        next and prev pointers of its neighbors.'''
+        if cur_node.prev is None:
+            self.head = cur_node.next
+        else:
+            cur_node.prev.next = cur_node.next
+        if cur_node.next is None:
+            self.tail = cur_node.prev
+        else:
+            cur_node.next.prev = cur_node.prev
+
     def __repr__(self):
         return f'dlinklist({str(self)})'
 
@@ -809,7 +1129,7 @@ class dlinklist(linklist):
         '''Return a reversed copy of the list.'''
         cur_node = self.tail
         reversed_list = dlinklist()
-        while cur_node != None:
+        while cur_node is not None:
             reversed_list.append(cur_node.data)
             cur_node = cur_node.prev
         return reversed_list
@@ -822,10 +1142,20 @@ class tree(object):
         if not isinstance(max_children, int) and max_children is not None:
             raise TypeError('max_children must be an int')
         self.max_children = max_children
+        #data -> [nodes] multimap kept by the tree-level mutators, so
+        #findnode and remove can hash-probe instead of walking the whole
+        #tree. Unhashable data is left unindexed, and detaching tnodes
+        #directly (bypassing the tree methods) leaves stale entries;
+        #findnode verifies attachment before trusting a hit and falls
+        #back to a traversal otherwise.
+        self._by_data = {}
+        self.size = 0
         if root_data is None:
             self.root = None
         else:
             self.root = tnode(root_data, [], self.max_children)
+            self._register(self.root)
+            self.size = 1
 
     def isbinary(self):
         '''Return True if the tree is a binary tree, False otherwise.'''
@@ -840,30 +1170,83 @@ class tree(object):
         if parent is None:
             if self.root is None:
                 self.root = tnode(item, [], self.max_children)
+                self._register(self.root)
+                self.size += 1
             else:
                 raise ValueError('tree already has a root')
         elif parent == self.root:
             if self.root is None:
                 raise ValueError('cannot add child to a non-existent root')
-            self.root.add(item)
+            self._register(self.root.add(item))
+            self.size += 1
         else:
             target = self.findnode(parent.data if isinstance(parent, tnode) else parent)
             if target is None:
                 raise ValueError('the specified parent is not in the tree')
-            target.add(item)
+            self._register(target.add(item))
+            self.size += 1
+
+    def _register(self, node): #Helper method
+        '''Helper method: Record a node in the data index; unhashable data
+        stays unindexed and is found by traversal instead.'''
+        try:
+            self._by_data.setdefault(node.data, []).append(node)
+        except TypeError:
+            pass
+
+    def _unregister(self, node): #Helper method
+        '''Helper method: Drop a node and its whole subtree from the data
+        index, returning the number of nodes dropped.'''
+        removed = 0
+        stack = [node]
+        while stack:
+            cur_node = stack.pop()
+            removed += 1
+            try:
+                entries = self._by_data.get(cur_node.data)
+            except TypeError:
+                entries = None
+            if entries:
+                for i, entry in enumerate(entries):
+                    if entry is cur_node:
+                        del entries[i]
+                        break
+                if not entries:
+                    del self._by_data[cur_node.data]
+            stack.extend(cur_node.children)
+        return removed
+
+    def _isattached(self, node): #Helper method
+        '''Helper method: Return True if the node is still linked under
+        this tree's root.'''
+        cur_node = node
+        while cur_node.parent is not None:
+            cur_node = cur_node.parent
+        return cur_node is self.root
 
     def findnode(self, target, node = None):
-        '''Find the first instance of the target in the tree.'''
+        '''Find the first instance of the target in the tree.
+        \nSearches breadth-first with an explicit deque: shallow matches
+        return early, and deep trees cannot hit the recursion limit.'''
         if node is None:
             node = self.root
+            if node is not None:
+                #One dict probe replaces the full-tree walk on a hit
+                try:
+                    candidates = self._by_data.get(target)
+                except TypeError:
+                    candidates = None
+                for candidate in candidates or ():
+                    if self._isattached(candidate):
+                        return candidate
         if node is None:
             return None
-        if node.data == target:
-            return node
-        for child in node.children:
-            found = self.findnode(target, child)
-            if found:
-                return found
+        pending = deque((node,))
+        while pending:
+            cur_node = pending.popleft()
+            if cur_node.data == target:
+                return cur_node
+            pending.extend(cur_node.children)
         return None
     
     def remove(self, target):
@@ -874,60 +1257,71 @@ class tree(object):
         # Special case: if the root is the target
         if self.root.data == target:
             self.root = None
+            self._by_data.clear()
+            self.size = 0
             return
 
-        # Helper function to find and remove the target node
-        def _removehelper(node, target):
-            for i, child in enumerate(node.children):
-                if child.data == target:
-                    # Remove the child and break the parent reference
-                    removed_node = node.children.pop(i)
-                    removed_node.parent = None
-                    return True
-                # Recursively check the child's children
-                if _removehelper(child, target):
-                    return True
-            return False
-
-        # Start the removal process from the root
-        if not _removehelper(self.root, target):
+        node = self.findnode(target)
+        if node is None or node.parent is None:
             raise ValueError(f'{target} is not in the tree')
+        #The parent pointer lets us unlink in O(1); no rescanning walk
+        node.parent.children.remove(node)
+        self.size -= self._unregister(node)
+        node.parent = None
         
     def preorder(self, node=None):
         '''Conduct a preorder traversal of the tree.
-        \nVisit the current node before its children.'''
+        \nVisit the current node before its children. Runs iteratively
+        with an explicit stack, appending into one result list, so deep
+        trees cost neither a Python frame nor a temporary list per node.'''
         if node is None:
             node = self.root
         if node is None:
             return []
-        result = [node.data]  # Visit the current node
-        for child in node.children:
-            result.extend(self.preorder(child))  # Recursively visit children
+        result = []
+        stack = [node]
+        while stack:
+            cur_node = stack.pop()
+            result.append(cur_node.data)
+            #Reversed so the leftmost child is popped (visited) first
+            stack.extend(reversed(cur_node.children))
         return result
 
     def postorder(self, node=None):
         '''Conduct a postorder traversal of the tree.
-        \nVisit the children of the current node before the node itself.'''
+        \nVisit the children of the current node before the node itself.
+        Uses the standard two-pass iterative form: collect nodes in
+        reverse-postorder with one stack, then reverse once at the end.'''
         if node is None:
             node = self.root
         if node is None:
             return []
-        result = []
-        for child in node.children:
-            result.extend(self.postorder(child))  # Recursively visit children
-        result.append(node.data)  # Visit the current node
-        return result
+        stack = [node]
+        visited = []
+        while stack:
+            cur_node = stack.pop()
+            visited.append(cur_node)
+            stack.extend(cur_node.children)
+        return [cur_node.data for cur_node in reversed(visited)]
     
     def height(self, node=None):
         '''Return the height of the tree.
-        \nThe height is the number of edges on the longest path from the node to a leaf.'''
+        \nThe height is the number of edges on the longest path from the node to a leaf.
+        Computed with an iterative (node, depth) stack rather than one
+        recursive call (and max() generator) per node.'''
         if node is None:
             node = self.root
         if node is None:
             return -1  # By convention, the height of an empty tree is -1
-        if node.isleaf():
-            return 0  # A leaf node has a height of 0
-        return 1 + max(self.height(child) for child in node.children)
+        height = 0
+        stack = [(node, 0)]
+        while stack:
+            cur_node, depth = stack.pop()
+            if depth > height:
+                height = depth
+            for child in cur_node.children:
+                stack.append((child, depth + 1))
+        return height
         
     def __contains__(self, target):
         '''Return True if the tree contains the node, False otherwise.'''
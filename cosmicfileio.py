@@ -1,101 +1,398 @@
 '''Cosmic Core: Cosmic File I/O
 \n\tA library of functions for reading and writing files in various formats.'''
 import csv
+import functools
 import json
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import gzip
 import os
+import shutil
 import tarfile
 import zipfile
+try:
+    #C-backed JSON backend, several times faster than the stdlib for both
+    #parsing and serializing; everything below falls back to json when it
+    #is not installed
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    #SIMD-accelerated drop-in for gzip (Intel ISA-L), roughly 2-5x faster
+    #at both compression and decompression; the gzip helpers fall back to
+    #the stdlib module when it is not installed
+    from isal import igzip as _gz
+except ImportError:
+    _gz = gzip
 __all__ = ['readtextfile', 'writetextfile', 'readbinaryfile', 'writebinaryfile',
-           'readcsvfile', 'writecsvfile', 'readjsonfile', 'writejsonfile',
+           'copybinaryfile',
+           'readcsvfile', 'readcsvrows', 'writecsvfile', 'readjsonfile',
+           'writejsonfile', 'writejsonarray',
            'compresszipfile', 'extractzipfile', 'compressgzipfile',
            'extractgzipfile']
 
 
+#128 KB buffer for the plain read/write helpers: several times faster
+#than the 8 KB default on sequential workloads; the bulk compression
+#paths use 1 MB buffers directly
+_DEFAULT_BUFFERING = 1 << 17
+
+
 #___Reading and Writing Text Files___
 def readtextfile(file_path):
     '''Read the contents of a text file.'''
-    with open(file_path, 'r', encoding='utf-8') as file:
+    with open(file_path, 'r', encoding='utf-8',
+              buffering=_DEFAULT_BUFFERING) as file:
         return file.read()
 
 def writetextfile(file_path, content):
     '''Write content to a text file.'''
-    with open(file_path, 'w', encoding='utf-8') as file:
+    with open(file_path, 'w', encoding='utf-8',
+              buffering=_DEFAULT_BUFFERING) as file:
         file.write(content)
 
 
 #___Reading and Writing Binary Files___
 def readbinaryfile(file_path):
     '''Read the contents of a binary file.'''
-    with open(file_path, 'rb') as file:
-        return file.read()
+    #One pre-sized os.read straight into the result bytes: no buffered
+    #layer, so no second copy and no extra fstat
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        if len(data) == size:
+            return data
+        #Short read (e.g. a file changing underneath us): finish in a loop
+        chunks = [data]
+        while True:
+            chunk = os.read(fd, 1 << 20)
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
 
 def writebinaryfile(file_path, content):
     '''Write the contents of a binary file.'''
-    with open(file_path, 'wb') as file:
+    with open(file_path, 'wb', buffering=_DEFAULT_BUFFERING) as file:
         file.write(content)
 
+def copybinaryfile(src_path, dest_path):
+    '''Copy a binary file.
+    \nThe data moves with in-kernel offload where the OS supports it -
+    copy_file_range first (which can reflink on capable filesystems),
+    then sendfile - so the payload never crosses into user space; other
+    platforms stream through a 1 MB buffer.'''
+    with open(src_path, 'rb') as f_in, open(dest_path, 'wb') as f_out:
+        fd_in = f_in.fileno()
+        fd_out = f_out.fileno()
+        remaining = os.fstat(fd_in).st_size
+        if hasattr(os, 'copy_file_range'):
+            try:
+                while remaining > 0:
+                    sent = os.copy_file_range(fd_in, fd_out, remaining)
+                    if sent == 0:
+                        break
+                    remaining -= sent
+                if remaining == 0:
+                    return
+            except OSError:
+                pass #Cross-device copy or unsupported filesystem
+            f_in.seek(0)
+            f_out.seek(0)
+            f_out.truncate()
+            remaining = os.fstat(fd_in).st_size
+        if hasattr(os, 'sendfile'):
+            try:
+                offset = 0
+                while remaining > 0:
+                    sent = os.sendfile(fd_out, fd_in, offset, remaining)
+                    if sent == 0:
+                        break
+                    offset += sent
+                    remaining -= sent
+                if remaining == 0:
+                    return
+            except OSError:
+                pass #sendfile between regular files needs Linux 2.6.33+
+            f_in.seek(0)
+            f_out.seek(0)
+            f_out.truncate()
+        shutil.copyfileobj(f_in, f_out, 1 << 20)
+
 
 #___Reading and Writing CSV Files___
-def readcsvfile(file_path):
-    '''Read and parse a CSV file.'''
-    with open(file_path, 'r', encoding='utf-8') as file:
-        reader = csv.reader(file)
-        return [row for row in reader]
+@functools.lru_cache(maxsize=128)
+def _readcsvcached(abs_path, mtime_ns, size):
+    '''Helper function: Parse and cache a CSV file as immutable tuples.
+    The stat fields in the key make edits to the file re-parse
+    automatically.'''
+    with open(abs_path, 'r', encoding='utf-8',
+              buffering=_DEFAULT_BUFFERING) as file:
+        return tuple(tuple(row) for row in csv.reader(file))
+
+def readcsvrows(file_path):
+    '''Iterate over the rows of a CSV file one at a time.
+    \nOnly one row is held in memory at once, so single-pass consumers
+    (filters, aggregations, imports) can stream files far larger than
+    RAM instead of materializing every row up front.'''
+    with open(file_path, 'r', encoding='utf-8',
+              buffering=_DEFAULT_BUFFERING) as file:
+        yield from csv.reader(file)
+
+def readcsvfile(file_path, cache = False):
+    '''Read and parse a CSV file.
+    \nWith cache=True, repeat reads of an unchanged file skip the parse:
+    results are cached keyed on the file's path, mtime and size, and each
+    call returns fresh row lists so mutating them cannot poison the
+    cache.'''
+    if cache:
+        stat = os.stat(file_path)
+        rows = _readcsvcached(os.path.abspath(file_path),
+                              stat.st_mtime_ns, stat.st_size)
+        return [list(row) for row in rows]
+    return list(readcsvrows(file_path))
 
 def writecsvfile(file_path, data):
     '''Write data to a CSV file.'''
-    with open(file_path, 'w', encoding='utf-8', newline='') as file:
+    with open(file_path, 'w', encoding='utf-8', newline='',
+              buffering=_DEFAULT_BUFFERING) as file:
         writer = csv.writer(file)
         writer.writerows(data)
 
 
 #___Reading and Writing JSON Files___
-def readjsonfile(file_path):
-    '''Read and parse a JSON file.'''
-    with open(file_path, 'r', encoding='utf-8') as file:
+def _loadjson(file_path):
+    '''Helper function: Parse a JSON file with the fastest available
+    backend. orjson works on raw bytes, skipping the Python-level UTF-8
+    decode entirely.'''
+    if orjson is not None:
+        return orjson.loads(readbinaryfile(file_path))
+    with open(file_path, 'r', encoding='utf-8',
+              buffering=_DEFAULT_BUFFERING) as file:
         return json.load(file)
 
+@functools.lru_cache(maxsize=128)
+def _readjsoncached(abs_path, mtime_ns, size):
+    '''Helper function: Parse and cache a JSON file. The stat fields in
+    the key make edits to the file re-parse automatically.'''
+    return _loadjson(abs_path)
+
+def readjsonfile(file_path, cache = False):
+    '''Read and parse a JSON file.
+    \nWith cache=True, repeat reads of an unchanged file return the
+    cached parse (keyed on the file's path, mtime and size). Treat a
+    cached result as read-only: it is shared between calls, so mutating
+    it would corrupt later reads.'''
+    if cache:
+        stat = os.stat(file_path)
+        return _readjsoncached(os.path.abspath(file_path),
+                               stat.st_mtime_ns, stat.st_size)
+    return _loadjson(file_path)
+
 def writejsonfile(file_path, data):
-    '''Write data to a JSON file.'''
-    with open(file_path, 'w', encoding='utf-8') as file:
-        json.dump(data, file, indent=4)
+    '''Write data to a JSON file.
+    \nWith orjson installed the output is serialized to one bytes buffer
+    and written in a single call (2-space indent); the stdlib fallback
+    keeps the 4-space indent.'''
+    if orjson is not None:
+        writebinaryfile(file_path,
+                        orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    #Serialize to one string first: json.dump drip-feeds the file object
+    #hundreds of tiny writes, one per token
+    with open(file_path, 'w', encoding='utf-8',
+              buffering=_DEFAULT_BUFFERING) as file:
+        file.write(json.dumps(data, indent=4))
+
+def writejsonarray(file_path, iterable):
+    '''Write an iterable of JSON-serializable items to a file as a single
+    JSON array, one element at a time.
+    \nOnly one element is ever serialized in memory, so generators of
+    records can be dumped without first materializing the whole list the
+    way writejsonfile(list(items)) would.'''
+    with open(file_path, 'w', encoding='utf-8',
+              buffering=_DEFAULT_BUFFERING) as file:
+        file.write('[')
+        first = True
+        for item in iterable:
+            if first:
+                first = False
+            else:
+                file.write(', ')
+            if orjson is not None:
+                file.write(orjson.dumps(item).decode('utf-8'))
+            else:
+                file.write(json.dumps(item))
+        file.write(']')
 
 #___Compressing and Decompressing Files___
+#Below this member count the thread pool costs more than it saves
+_PARALLEL_ZIP_MIN_FILES = 4
+
+#Formats that are already compressed: deflating them burns CPU to gain
+#nothing (often growing the member), so they are stored verbatim
+_STORED_EXT = frozenset(('.png', '.jpg', '.jpeg', '.gif', '.webp', '.mp4',
+                         '.mp3', '.zip', '.gz', '.xz', '.bz2', '.7z',
+                         '.zst', '.woff', '.woff2'))
+
+def _membertype(full_path):
+    '''Helper function: Pick the zip compression method for a file by
+    extension - ZIP_STORED for already-compressed formats, ZIP_DEFLATED
+    otherwise.'''
+    ext = os.path.splitext(full_path)[1].lower()
+    return zipfile.ZIP_STORED if ext in _STORED_EXT else zipfile.ZIP_DEFLATED
+
+def _deflatemember(full_path, arcname):
+    '''Helper function: Read and compress one file for a zip archive,
+    returning its ZipInfo (CRC and sizes filled in) and the member
+    payload - raw deflate bytes, or the data verbatim for stored
+    members. Runs in worker threads; zlib releases the GIL while
+    compressing, so the deflate work genuinely overlaps.'''
+    data = readbinaryfile(full_path)
+    zinfo = zipfile.ZipInfo.from_file(full_path, arcname)
+    zinfo.compress_type = _membertype(full_path)
+    zinfo.CRC = zlib.crc32(data)
+    zinfo.file_size = len(data)
+    if zinfo.compress_type == zipfile.ZIP_STORED:
+        zinfo.compress_size = len(data)
+        return zinfo, data
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15) #Raw deflate
+    compressed = compressor.compress(data) + compressor.flush()
+    zinfo.compress_size = len(compressed)
+    return zinfo, compressed
+
+def _appendmember(zipf, zinfo, compressed):
+    '''Helper function: Append an already-deflated member to an open
+    ZipFile, writing the local header and payload directly instead of
+    re-running the serial compression path.'''
+    zipf._didModify = True
+    zinfo.header_offset = zipf.fp.tell()
+    zip64 = (zinfo.file_size >= zipfile.ZIP64_LIMIT
+             or zinfo.compress_size >= zipfile.ZIP64_LIMIT)
+    zipf.fp.write(zinfo.FileHeader(zip64))
+    zipf.fp.write(compressed)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = zipf.fp.tell()
+
 def compresszipfile(file_paths, zip_file_path):
-    '''Compress files or directories into a zip archive.'''
+    '''Compress files or directories into a zip archive.
+    \nArchives with several members deflate them in parallel worker
+    threads and append the precompressed payloads, scaling with core
+    count; small jobs keep the plain serial path.'''
+    members = []
+    for file_path in file_paths:
+        if os.path.isdir(file_path):
+            #The archive root is invariant across the walk, so slice it
+            #off each joined path once instead of re-running relpath's
+            #normalization and component comparison per file
+            base = os.path.dirname(file_path)
+            base_len = len(base) + 1 if base else 0 #+1 drops the separator
+            for root, _, files in os.walk(file_path):
+                for file in files:
+                    full_path = os.path.join(root, file)
+                    members.append((full_path, full_path[base_len:]))
+        else:
+            members.append((file_path, os.path.basename(file_path)))
+
     with zipfile.ZipFile(zip_file_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for file_path in file_paths:
-            if os.path.isdir(file_path):
-                for root, _, files in os.walk(file_path):
-                    for file in files:
-                        full_path = os.path.join(root, file)
-                        arcname = os.path.relpath(full_path, os.path.dirname(file_path))
-                        zipf.write(full_path, arcname)
-            else:
-                zipf.write(file_path, os.path.basename(file_path))
+        if len(members) < _PARALLEL_ZIP_MIN_FILES:
+            for full_path, arcname in members:
+                zipf.write(full_path, arcname,
+                           compress_type=_membertype(full_path))
+            return
+        workers = min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            #Sliding window of in-flight futures bounds the compressed
+            #buffers held in memory while keeping every worker busy
+            futures = deque()
+            for member in members:
+                futures.append(pool.submit(_deflatemember, *member))
+                if len(futures) >= workers * 4:
+                    zinfo, compressed = futures.popleft().result()
+                    _appendmember(zipf, zinfo, compressed)
+            while futures:
+                zinfo, compressed = futures.popleft().result()
+                _appendmember(zipf, zinfo, compressed)
 
 
+def _extractmembers(zip_file_path, names, dest_dir):
+    '''Helper function: Extract a batch of members through a private
+    ZipFile handle. Workers cannot share one handle - every member read
+    seeks the shared file object, so concurrent reads would interleave -
+    and a handle per worker keeps the inflate work truly parallel (zlib
+    releases the GIL while inflating).'''
+    with zipfile.ZipFile(zip_file_path, 'r') as zipf:
+        for name in names:
+            zipf.extract(name, dest_dir)
+
 def extractzipfile(zip_file_path, dest_dir):
-    '''Extract the contents of a zip archive to a destination directory.'''
+    '''Extract the contents of a zip archive to a destination directory.
+    \nArchives with several members are inflated by parallel worker
+    threads; small jobs keep the plain extractall path.'''
     with zipfile.ZipFile(zip_file_path, 'r') as zipf:
-        zipf.extractall(dest_dir)
+        names = zipf.namelist()
+        files = [name for name in names if not name.endswith('/')]
+        if len(files) < _PARALLEL_ZIP_MIN_FILES:
+            zipf.extractall(dest_dir)
+            return
+    #Pre-create the directory tree up front: zipfile's own makedirs call
+    #is not race-safe, so the workers must only ever write files. Path
+    #components are filtered the same way extract filters them, so a
+    #crafted name can never climb out of dest_dir
+    os.makedirs(dest_dir, exist_ok=True)
+    for name in names:
+        parent = os.path.dirname(name)
+        parts = [part for part in parent.split('/')
+                 if part not in ('', '.', '..')]
+        if parts:
+            os.makedirs(os.path.join(dest_dir, *parts), exist_ok=True)
+    workers = min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batches = [files[i::workers] for i in range(workers)]
+        futures = [pool.submit(_extractmembers, zip_file_path, batch, dest_dir)
+                   for batch in batches if batch]
+        for future in futures:
+            future.result()
 
 
 def compressgzipfile(file_path, gzip_file_path):
     '''Compress a file into a gzip archive.'''
-    with open(file_path, 'rb') as f_in:
-        with gzip.open(gzip_file_path, 'wb') as f_out:
-            f_out.writelines(f_in)
+    if _gz is not gzip:
+        #isal's igzip only accepts levels 0-3 (its level 2 lands near
+        #zlib 6 in ratio while compressing several times faster)
+        with open(file_path, 'rb', buffering=1 << 20) as f_in:
+            with _gz.open(gzip_file_path, 'wb', compresslevel=2) as f_out:
+                shutil.copyfileobj(f_in, f_out, 1 << 20)
+        return
+    #Drive zlib directly with wbits 31 (deflate in a gzip container):
+    #one compress call per 1 MB block straight into the output file,
+    #skipping GzipFile's per-write Python layer and separate CRC pass
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    with open(file_path, 'rb', buffering=1 << 20) as f_in:
+        with open(gzip_file_path, 'wb', buffering=1 << 20) as f_out:
+            while True:
+                block = f_in.read(1 << 20)
+                if not block:
+                    break
+                f_out.write(compressor.compress(block))
+            f_out.write(compressor.flush())
 
 
 def extractgzipfile(gzip_file_path, dest_dir):
     '''Extract the contents of a gzip archive to a destination directory.'''
-    file_name = os.path.basename(gzip_file_path).replace('.gz', '')
+    #Strip only a trailing .gz: replace('.gz', '') also deleted interior
+    #occurrences, mangling names like my.gz.data.gz
+    file_name = os.path.basename(gzip_file_path).removesuffix('.gz')
     dest_file_path = os.path.join(dest_dir, file_name)
-    with gzip.open(gzip_file_path, 'rb') as f_in:
-        with open(dest_file_path, 'wb') as f_out:
-            f_out.write(f_in.read())
+    with _gz.open(gzip_file_path, 'rb') as f_in:
+        with open(dest_file_path, 'wb', buffering=1 << 20) as f_out:
+            #Stream through a fixed 1 MB buffer rather than materializing
+            #the whole decompressed payload in memory with f_in.read()
+            shutil.copyfileobj(f_in, f_out, 1 << 20)
 
 def createtararchive(source, destination, compression=None):
     '''Create a tar archive of a file or directory.